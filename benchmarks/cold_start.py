@@ -0,0 +1,73 @@
+"""Cold-start latency of steenroder in a fresh process.
+
+Each measurement runs in a new Python process with ``NUMBA_CACHE_DIR`` pointing
+to a private directory, which starts out empty. The first run therefore
+compiles every kernel, while later runs load them from numba's on-disk cache.
+
+Usage::
+
+    python benchmarks/cold_start.py [--repeat N]
+
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json
+import time
+
+tic = time.perf_counter()
+import numpy as np
+import steenroder
+import_time = time.perf_counter() - tic
+
+X = np.random.default_rng(0).normal(size=(30, 3))
+tic = time.perf_counter()
+filtration_by_dim, filtration_values = steenroder.rips_filtration(X, maxdim=2)
+steenroder.barcodes(1, filtration_by_dim, filtration_values=filtration_values)
+first_call_time = time.perf_counter() - tic
+
+tic = time.perf_counter()
+steenroder.barcodes(1, filtration_by_dim, filtration_values=filtration_values)
+second_call_time = time.perf_counter() - tic
+
+print(json.dumps({"import": import_time, "first call": first_call_time,
+                  "second call": second_call_time}))
+"""
+
+
+def run_child(cache_dir):
+    env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir,
+               PYTHONPATH=os.pathsep.join(
+                   filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")])
+                   ))
+    output = subprocess.run([sys.executable, "-c", CHILD], env=env,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of runs with a warm on-disk cache.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = [("cold (compile)", run_child(cache_dir))]
+        for i in range(args.repeat):
+            results.append((f"cached #{i + 1}", run_child(cache_dir)))
+
+    print(f"{'run':<16}{'import':>10}{'first call':>14}{'second call':>14}")
+    for name, times in results:
+        print(f"{name:<16}{times['import']:>10.3f}{times['first call']:>14.3f}"
+              f"{times['second call']:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Inputs for the benchmarks: synthetic triangulations and point clouds.
+
+Each builder returns a dict with keys ``"filtration"``, ``"offsets"`` and
+``"filtration_values"``, ready to be passed to `steenroder.barcodes`.
+"""
+import os
+from itertools import combinations, permutations, product
+
+import numpy as np
+
+from steenroder import rips_filtration
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "data")
+
+
+def _closure(top_simplices):
+    """All faces of the given simplices, ordered by dimension and then
+    lexicographically."""
+    simplices = set()
+    for spx in top_simplices:
+        for r in range(1, len(spx) + 1):
+            simplices.update(combinations(sorted(spx), r))
+
+    return sorted(simplices, key=lambda spx: (len(spx), spx))
+
+
+def rp_triangulation(n):
+    """Triangulation of the real projective space RP^n, as the quotient by the
+    antipodal map of the barycentric subdivision of the boundary of the
+    ``(n + 1)``-dimensional cross-polytope."""
+    vertices = {}
+
+    def vertex(face):
+        # Faces are sign vectors, identified with their negatives
+        sign = next(s for s in face if s)
+        face = tuple(sign * s for s in face)
+        return vertices.setdefault(face, len(vertices))
+
+    top_simplices = set()
+    for perm in permutations(range(n + 1)):
+        for signs in product((1, -1), repeat=n):
+            # The sign of the first coordinate can be fixed by symmetry
+            face = [0] * (n + 1)
+            chain = []
+            for i, s in zip(perm, (1,) + signs):
+                face[i] = s
+                chain.append(vertex(face))
+            top_simplices.add(tuple(sorted(chain)))
+
+    return {"filtration": _closure(top_simplices), "offsets": None,
+            "filtration_values": None}
+
+
+def cone(dataset):
+    """Cone on a triangulation, filtered by adding all of it first and then
+    the apex and the cones on its simplices, by dimension."""
+    filtration = dataset["filtration"]
+    apex = max(max(spx) for spx in filtration) + 1
+    cone_simplices = [(apex,)] + [spx + (apex,) for spx in filtration]
+
+    return {"filtration": filtration + sorted(cone_simplices, key=len),
+            "offsets": None, "filtration_values": None}
+
+
+def _rips(X, threshold, maxdim):
+    filtration_by_dim, filtration_values = rips_filtration(
+        X, threshold=threshold, maxdim=maxdim
+        )
+    # Flatten in filtration order, to also exercise `sort_filtration_by_dim`
+    n_simplices = len(filtration_values)
+    lengths = np.empty(n_simplices, dtype=np.int64)
+    for dim, (idxs_dim, _) in enumerate(filtration_by_dim):
+        lengths[idxs_dim] = dim + 1
+    offsets = np.zeros(n_simplices + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    vertices = np.empty(offsets[-1], dtype=np.int64)
+    for dim, (idxs_dim, tups_dim) in enumerate(filtration_by_dim):
+        vertices[offsets[idxs_dim, np.newaxis] + np.arange(dim + 1)] = tups_dim
+
+    return {"filtration": vertices, "offsets": offsets,
+            "filtration_values": filtration_values}
+
+
+def flat_klein_bottle(num, threshold=0.3, maxdim=3):
+    """Vietoris–Rips filtration of a ``num x num`` grid on the flat Klein
+    bottle, obtained from the unit square by gluing its sides."""
+    grid = np.linspace(0, 1, num=num, endpoint=False)
+    square = np.stack(np.meshgrid(grid, grid, indexing="ij"),
+                      axis=-1).reshape(-1, 2)
+    # Images of the square under the gluing, around the fundamental domain
+    flipped = square * [1, -1] + [0, 1]
+    copies = [square + [0, dy] for dy in (0, 1, -1)] + \
+        [flipped + [dx, dy] for dx in (1, -1) for dy in (0, 1, -1)]
+    sq_dists = np.min([np.sum((square[:, np.newaxis] - copy) ** 2, axis=-1)
+                       for copy in copies], axis=0)
+    dm = np.sqrt(sq_dists)[np.triu_indices(len(square), k=1)]
+
+    return _rips(dm, threshold, maxdim)
+
+
+def cyclo_octane(n_samples, threshold=1.2, maxdim=2, seed=0):
+    """Vietoris–Rips filtration of a random subsample of the cyclo-octane
+    conformation space in ``data/pointsCycloOctane.mat``. Requires scipy."""
+    from scipy.io import loadmat
+
+    X = loadmat(os.path.join(DATA_DIR, "pointsCycloOctane.mat"))[
+        "pointsCycloOctane"
+        ]
+    rng = np.random.default_rng(seed)
+    X = X[rng.choice(len(X), n_samples, replace=False)]
+
+    return _rips(X, threshold, maxdim)
+
+
+CASES = {
+    **{f"rp{n}": (rp_triangulation, (n,)) for n in (2, 3, 4)},
+    **{f"cone_rp{n}": (lambda n: cone(rp_triangulation(n)), (n,))
+       for n in (2, 3, 4)},
+    **{f"klein_{num}": (flat_klein_bottle, (num,)) for num in (6, 10, 15)},
+    **{f"cyclo_octane_{n}": (cyclo_octane, (n,)) for n in (200, 400, 800)},
+    }
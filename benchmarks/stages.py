@@ -0,0 +1,173 @@
+"""Time and memory profile of each stage of the steenroder pipeline.
+
+For each case in `datasets.CASES`, the stages `sort_filtration_by_dim`,
+`get_reduced_triangular`, `get_barcode_and_coho_reps`, `get_steenrod_matrix`
+and `get_steenrod_barcode` are run once ("first", which includes JIT
+compilation or loading from numba's cache for the first case of a run) and then
+``--repeat`` more times ("warm", the minimum is reported). `get_steenrod_matrix`
+is additionally timed for each value of ``--n-jobs``. Peak memory is the
+increase of the peak resident set size over its value at the start of the
+stage, maximized over runs.
+
+Usage::
+
+    python benchmarks/stages.py [--cases rp2 klein_6 ...] [--k 1]
+        [--repeat 3] [--n-jobs 1 2 4] [--no-cache] [--json results.json]
+
+With ``--no-cache``, numba's on-disk cache is redirected to an empty temporary
+directory, so that "first" timings of the first case include compilation.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+import psutil
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STAGES = ("sort_filtration_by_dim", "get_reduced_triangular",
+          "get_barcode_and_coho_reps", "get_steenrod_matrix",
+          "get_steenrod_barcode")
+
+
+def _peak_rss():
+    """Peak resident set size since the last call to `_reset_peak_rss`, or
+    the current one if peaks cannot be read."""
+    try:
+        with open("/proc/self/status") as f:
+            return int(re.search(r"VmHWM:\s+(\d+)", f.read()).group(1)) * 1024
+    except (OSError, AttributeError):
+        return psutil.Process().memory_info().rss
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _measure(func, *args, **kwargs):
+    """Call `func` and return its output, the wall-clock time taken and the
+    increase in peak RSS."""
+    _reset_peak_rss()
+    rss = psutil.Process().memory_info().rss
+    tic = time.perf_counter()
+    output = func(*args, **kwargs)
+    toc = time.perf_counter()
+
+    return output, toc - tic, max(_peak_rss() - rss, 0)
+
+
+def run_pipeline(st, dataset, k, n_jobs):
+    """Run all stages once, and return the time and peak memory of each."""
+    results = {}
+    filtration_values = dataset["filtration_values"]
+    filtration_by_dim, *results["sort_filtration_by_dim"] = _measure(
+        st.sort_filtration_by_dim, dataset["filtration"],
+        offsets=dataset["offsets"]
+        )
+    reduction, *results["get_reduced_triangular"] = _measure(
+        st.get_reduced_triangular, filtration_by_dim
+        )
+    simplex_index, idxs, reduced, triangular = reduction
+    (barcode, coho_reps), *results["get_barcode_and_coho_reps"] = _measure(
+        st.get_barcode_and_coho_reps, idxs, reduced, triangular,
+        filtration_values=filtration_values
+        )
+    steenrod_matrix, *results["get_steenrod_matrix"] = _measure(
+        st.get_steenrod_matrix, k, coho_reps, filtration_by_dim,
+        simplex_index, n_jobs=n_jobs
+        )
+    _, *results["get_steenrod_barcode"] = _measure(
+        st.get_steenrod_barcode, k, steenrod_matrix, idxs, reduced, barcode,
+        filtration_values=filtration_values
+        )
+
+    return results, (coho_reps, filtration_by_dim, simplex_index)
+
+
+def benchmark_case(st, dataset, k, repeat, n_jobs_list):
+    first, (coho_reps, filtration_by_dim, simplex_index) = \
+        run_pipeline(st, dataset, k, n_jobs_list[0])
+    warm = [run_pipeline(st, dataset, k, n_jobs_list[0])[0]
+            for _ in range(repeat)]
+    rows = {}
+    for stage in STAGES:
+        runs = [first[stage]] + [results[stage] for results in warm]
+        rows[stage] = {
+            "first": first[stage][0],
+            "warm": min(t for t, _ in runs[1:]) if repeat else None,
+            "peak_memory": max(m for _, m in runs)
+            }
+
+    for n_jobs in n_jobs_list:
+        times = []
+        for _ in range(max(repeat, 1)):
+            _, t, _ = _measure(st.get_steenrod_matrix, k, coho_reps,
+                               filtration_by_dim, simplex_index,
+                               n_jobs=n_jobs)
+            times.append(t)
+        rows[f"get_steenrod_matrix[n_jobs={n_jobs}]"] = {"warm": min(times)}
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Cases to run (default: all).")
+    parser.add_argument("--k", type=int, default=1,
+                        help="Steenrod square Sq^k to compute.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of warm runs per case.")
+    parser.add_argument("--n-jobs", type=int, nargs="+",
+                        default=sorted({1, 2, psutil.cpu_count(logical=False)}),
+                        help="Thread counts for get_steenrod_matrix.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Compile all kernels from scratch.")
+    parser.add_argument("--json", default=None,
+                        help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["NUMBA_CACHE_DIR"] = tempfile.mkdtemp()
+    sys.path.insert(0, REPO_DIR)
+    import steenroder as st
+    from datasets import CASES
+
+    names = args.cases or list(CASES)
+    all_results = {}
+    print(f"{'case':<18}{'stage':<42}{'first (s)':>11}{'warm (s)':>11}"
+          f"{'peak (MiB)':>12}")
+    for name in names:
+        builder, builder_args = CASES[name]
+        try:
+            dataset = builder(*builder_args)
+        except ImportError as e:
+            print(f"{name:<18}skipped: {e}")
+            continue
+        rows = benchmark_case(st, dataset, args.k, args.repeat, args.n_jobs)
+        all_results[name] = rows
+        for stage, row in rows.items():
+            first = row.get("first")
+            warm = row.get("warm")
+            peak = row.get("peak_memory")
+            print(f"{name:<18}{stage:<42}"
+                  f"{'' if first is None else f'{first:.4f}':>11}"
+                  f"{'' if warm is None else f'{warm:.4f}':>11}"
+                  f"{'' if peak is None else f'{peak / 2 ** 20:.1f}':>12}")
+
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump({"k": args.k, "repeat": args.repeat,
+                       "results": all_results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
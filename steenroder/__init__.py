@@ -1,33 +1,50 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
 import time
-from functools import lru_cache
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from itertools import chain, combinations, repeat
+from math import comb
 import psutil
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 import numba as nb
 import numpy as np
-from numba.cpython.unsafe.tuple import tuple_setitem
-from numba.np.unsafe.ndarray import to_fixed_tuple
-
-list_of_int64_typ = nb.types.List(nb.int64)
-int64_2d_array_typ = nb.types.Array(nb.int64, 2, "C")
 
 # Determine the number of available physical cores
 N_PHYSICAL_CORES = psutil.cpu_count(logical=False)
 
 
-def sort_filtration_by_dim(filtration, maxdim=None):
+def sort_filtration_by_dim(filtration, maxdim=None, offsets=None):
     """Organize an input simplex-wise filtration by dimension.
 
     Parameters
     ----------
-    filtration : sequence of list-like of int
+    filtration : sequence of list-like of int, or ndarray
         Represents a simplex-wise filtration. Entry ``i`` is a list/tuple/set
         containing the integer indices of the vertices defining the ``i``th
-        simplex in the filtration.
+        simplex in the filtration. If `offsets` is passed, this must instead be
+        a flat 1D int array of vertices, see `offsets`.
 
     maxdim : int or None, optional, default: None
         Maximum simplex dimension to be included. ``None`` means that all
         simplices are included.
 
+    offsets : ndarray or None, optional, default: None
+        If not ``None``, a 1D int array of length ``n_simplices + 1`` such that
+        the vertices of the ``i``th simplex in the filtration are
+        ``filtration[offsets[i]:offsets[i + 1]]`` (compressed sparse row
+        format). This avoids creating one Python object per simplex.
+
     Returns
     -------
     filtration_by_dim : list of list of ndarray
@@ -38,105 +55,1107 @@ def sort_filtration_by_dim(filtration, maxdim=None):
         ``i``-th ``d``-dimensional simplex.
 
     """
-    if maxdim is None:
-        maxdim = max(map(len, filtration)) - 1
+    if offsets is None:
+        filtration, offsets = _to_csr_filtration(filtration)
+    vertices = np.asarray(filtration, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
 
-    filtration_by_dim = [[] for _ in range(maxdim + 1)]
-    for i, spx in enumerate(filtration):
-        spx_tup = tuple(sorted(spx))
-        dim = len(spx_tup) - 1
-        if dim <= maxdim:
-            filtration_by_dim[dim].append([i, spx_tup])
+    dims = np.diff(offsets) - 1
+    if maxdim is None:
+        maxdim = dims.max(initial=0)
 
-    for dim, filtr in enumerate(filtration_by_dim):
-        filtration_by_dim[dim] = [np.asarray(x, dtype=np.int64)
-                                  for x in zip(*filtr)]
+    filtration_by_dim = []
+    for dim in range(maxdim + 1):
+        idxs_dim = np.flatnonzero(dims == dim)
+        tups_dim = vertices[offsets[idxs_dim, np.newaxis] +
+                            np.arange(dim + 1, dtype=np.int64)]
+        tups_dim.sort(axis=1)
+        filtration_by_dim.append([idxs_dim.astype(np.int64, copy=False),
+                                  tups_dim])
 
     return filtration_by_dim
 
 
-@nb.njit
+def _to_csr_filtration(filtration):
+    """Flatten a sequence of simplices into a vertex array and offsets."""
+    lengths = np.fromiter(map(len, filtration), dtype=np.int64,
+                          count=len(filtration))
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    vertices = np.fromiter(chain.from_iterable(filtration), dtype=np.int64,
+                           count=offsets[-1])
+
+    return vertices, offsets
+
+
+def save_filtration(path, filtration_by_dim, filtration_values=None):
+    """Store a filtration organized by dimension as a directory of ``.npy``
+    files, which can be memory-mapped back by `load_filtration` or passed to
+    `barcodes` directly.
+
+    The directory contains, for each dimension ``d``, the files
+    ``idxs_{d}.npy`` and ``tups_{d}.npy`` holding the two arrays in
+    ``filtration_by_dim[d]`` as int64, and ``filtration_values.npy`` if
+    `filtration_values` is passed. Files in this layout can also be written
+    directly by other programs, e.g. with `numpy.lib.format.open_memmap`.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Directory to be created if needed. Existing files are overwritten.
+
+    filtration_by_dim : list of list of ndarray
+        Filtration organized by dimension, as returned by
+        `sort_filtration_by_dim` or `rips_filtration`.
+
+    filtration_values : ndarray or None, optional, default: None
+        Optionally, a 1D array of filtration values for each simplex in the
+        filtration.
+
+    """
+    os.makedirs(path, exist_ok=True)
+    for dim, (idxs_dim, tups_dim) in enumerate(filtration_by_dim):
+        np.save(os.path.join(path, f"idxs_{dim}.npy"),
+                np.asarray(idxs_dim, dtype=np.int64))
+        np.save(os.path.join(path, f"tups_{dim}.npy"),
+                np.asarray(tups_dim, dtype=np.int64))
+    if filtration_values is not None:
+        np.save(os.path.join(path, "filtration_values.npy"),
+                np.asarray(filtration_values))
+
+
+def load_filtration(path, maxdim=None):
+    """Memory-map a filtration stored by `save_filtration`.
+
+    Arrays are memory-mapped in copy-on-write mode, so that the files cannot be
+    altered, and pages are only read from disk when the computation needs
+    them. No copies are made, except of arrays whose dtype is not int64, which
+    are converted.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Directory in the layout described in `save_filtration`.
+
+    maxdim : int or None, optional, default: None
+        Maximum simplex dimension to be loaded. ``None`` means that all
+        dimensions stored are loaded.
+
+    Returns
+    -------
+    filtration_by_dim : list of list of ndarray
+        For each dimension ``d``, a list of 2 aligned int arrays, as returned
+        by `sort_filtration_by_dim`.
+
+    filtration_values : ndarray or None
+        The stored filtration values, or ``None`` if there are none.
+
+    """
+    def load(name):
+        return np.asarray(np.load(os.path.join(path, name), mmap_mode="c"))
+
+    filtration_by_dim = []
+    dim = 0
+    while (maxdim is None or dim <= maxdim) and \
+            os.path.exists(os.path.join(path, f"idxs_{dim}.npy")):
+        idxs_dim = load(f"idxs_{dim}.npy").astype(np.int64, copy=False)
+        tups_dim = load(f"tups_{dim}.npy").astype(np.int64, copy=False)
+        if tups_dim.shape != (len(idxs_dim), dim + 1):
+            raise ValueError(
+                f"Simplices in dimension {dim} must be stored as an array of "
+                f"shape ({len(idxs_dim)}, {dim + 1}), got {tups_dim.shape}."
+                )
+        filtration_by_dim.append([idxs_dim, tups_dim])
+        dim += 1
+    if not filtration_by_dim:
+        raise ValueError(f"No filtration found in {path}.")
+    try:
+        filtration_values = load("filtration_values.npy")
+    except FileNotFoundError:
+        filtration_values = None
+
+    return filtration_by_dim, filtration_values
+
+
+@nb.njit(cache=True)
+def _sq_euclidean(x, y):
+    result = 0.
+    for i in range(len(x)):
+        result += (x[i] - y[i]) ** 2
+    return result
+
+
+@nb.njit(cache=True)
+def _rips_edges_from_points(X, threshold):
+    """Upper adjacency (CSR) of the Vietoris–Rips graph of a point cloud."""
+    n = len(X)
+    threshold_sq = threshold * threshold
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    for i in range(n):
+        count = 0
+        for j in range(i + 1, n):
+            if _sq_euclidean(X[i], X[j]) <= threshold_sq:
+                count += 1
+        indptr[i + 1] = indptr[i] + count
+
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    edge_values = np.empty(indptr[-1], dtype=np.float64)
+    for i in range(n):
+        pos = indptr[i]
+        for j in range(i + 1, n):
+            dist_sq = _sq_euclidean(X[i], X[j])
+            if dist_sq <= threshold_sq:
+                indices[pos] = j
+                edge_values[pos] = np.sqrt(dist_sq)
+                pos += 1
+
+    return indptr, indices, edge_values
+
+
+@nb.njit(cache=True)
+def _rips_edges_from_distances(dm, n, threshold):
+    """Upper adjacency (CSR) of the Vietoris–Rips graph of a condensed
+    distance matrix on `n` points."""
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    for i in range(n):
+        count = 0
+        offset = n * i - (i * (i + 1)) // 2 - i - 1
+        for j in range(i + 1, n):
+            if dm[offset + j] <= threshold:
+                count += 1
+        indptr[i + 1] = indptr[i] + count
+
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    edge_values = np.empty(indptr[-1], dtype=np.float64)
+    for i in range(n):
+        pos = indptr[i]
+        offset = n * i - (i * (i + 1)) // 2 - i - 1
+        for j in range(i + 1, n):
+            if dm[offset + j] <= threshold:
+                indices[pos] = j
+                edge_values[pos] = dm[offset + j]
+                pos += 1
+
+    return indptr, indices, edge_values
+
+
+@nb.njit(cache=True)
+def _symmetric_adjacency(n_vertices, indptr, indices):
+    """Sorted neighbors of each vertex in a graph given by its upper adjacency
+    (CSR), together with the positions of the corresponding edges in the
+    upper adjacency."""
+    degrees = np.zeros(n_vertices + 1, dtype=np.int64)
+    for i in range(n_vertices):
+        degrees[i + 1] += indptr[i + 1] - indptr[i]
+        for pos in range(indptr[i], indptr[i + 1]):
+            degrees[indices[pos] + 1] += 1
+    nbrs_indptr = np.cumsum(degrees)
+    nbrs = np.empty(nbrs_indptr[-1], dtype=np.int64)
+    nbr_edges = np.empty(nbrs_indptr[-1], dtype=np.int64)
+    ends = nbrs_indptr[:-1].copy()
+    # Lower neighbors are visited in increasing order, then upper neighbors
+    for i in range(n_vertices):
+        for pos in range(indptr[i], indptr[i + 1]):
+            j = indices[pos]
+            nbrs[ends[j]] = i
+            nbr_edges[ends[j]] = pos
+            ends[j] += 1
+    for i in range(n_vertices):
+        for pos in range(indptr[i], indptr[i + 1]):
+            nbrs[ends[i]] = indices[pos]
+            nbr_edges[ends[i]] = pos
+            ends[i] += 1
+
+    return nbrs_indptr, nbrs, nbr_edges
+
+
+@nb.njit(cache=True)
+def _first_undominated_value(u, v, value, nbrs_indptr, nbrs, nbr_edges,
+                             edge_values):
+    """Smallest filtration value, not smaller than `value`, at which the edge
+    ``(u, v)`` is not dominated, or ``numpy.inf`` if it stays dominated.
+
+    An edge is dominated in a graph by a vertex ``w`` when ``w`` is adjacent
+    to all the common neighbors of ``u`` and ``v`` other than itself,
+    including ``u`` and ``v``. Only the subgraph induced on the eventual common
+    neighbors matters: the events changing it are sorted by value, and the
+    number of dominating vertices is maintained as they are applied."""
+    # Common neighbors, and the values from which they are
+    pos_u, end_u = nbrs_indptr[u], nbrs_indptr[u + 1]
+    pos_v, end_v = nbrs_indptr[v], nbrs_indptr[v + 1]
+    common = np.empty(min(end_u - pos_u, end_v - pos_v), dtype=np.int64)
+    common_values = np.empty(len(common), dtype=np.float64)
+    n_common = 0
+    while pos_u < end_u and pos_v < end_v:
+        if nbrs[pos_u] < nbrs[pos_v]:
+            pos_u += 1
+        elif nbrs[pos_v] < nbrs[pos_u]:
+            pos_v += 1
+        else:
+            common_value = max(edge_values[nbr_edges[pos_u]],
+                               edge_values[nbr_edges[pos_v]])
+            if common_value < np.inf:
+                common[n_common] = nbrs[pos_u]
+                common_values[n_common] = common_value
+                n_common += 1
+            pos_u += 1
+            pos_v += 1
+    if not n_common:
+        return value
+    common = common[:n_common]
+
+    # Events: a vertex becomes a common neighbor (encoded as a pair with
+    # itself), or two common neighbors become adjacent
+    event_values = [common_values[x] for x in range(n_common)]
+    event_pairs = [(x, x) for x in range(n_common)]
+    for x in range(n_common):
+        pos, end = nbrs_indptr[common[x]], nbrs_indptr[common[x] + 1]
+        w = x + 1
+        while pos < end and w < n_common:
+            if nbrs[pos] < common[w]:
+                pos += 1
+            elif common[w] < nbrs[pos]:
+                w += 1
+            else:
+                edge_value = edge_values[nbr_edges[pos]]
+                if edge_value < np.inf:
+                    event_values.append(max(edge_value, common_values[x],
+                                            common_values[w]))
+                    event_pairs.append((x, w))
+                pos += 1
+                w += 1
+    event_values = np.asarray(event_values)
+    order = np.argsort(event_values, kind="mergesort")
+    if event_values[order[0]] > value:
+        # No common neighbors yet
+        return value
+
+    active = np.zeros(n_common, dtype=np.bool_)
+    n_active = 0
+    n_adjacent = np.zeros(n_common, dtype=np.int64)
+    n_dominating = 0
+    i = 0
+    while i < len(order):
+        current_value = max(event_values[order[i]], value)
+        recount = False
+        while i < len(order) and event_values[order[i]] <= current_value:
+            x, w = event_pairs[order[i]]
+            if x == w:
+                active[x] = True
+                n_active += 1
+                recount = True
+            else:
+                for y in (x, w):
+                    n_adjacent[y] += 1
+                    if n_adjacent[y] == n_active - 1:
+                        n_dominating += 1
+            i += 1
+        if recount:
+            n_dominating = 0
+            for x in range(n_common):
+                if active[x] and n_adjacent[x] == n_active - 1:
+                    n_dominating += 1
+        if not n_dominating:
+            return current_value
+
+    return np.inf
+
+
+@nb.njit(cache=True)
+def _collapse_edges(n_vertices, indptr, indices, edge_values):
+    """Filtered edge collapse of a flag filtration given by the upper
+    adjacency (CSR) of its 1-skeleton, as in J.-D. Boissonnat and S. Pritam,
+    "Edge collapse and persistence of flag complexes", and M. Glisse and S.
+    Pritam, "Swap, shift and trim to edge collapse a filtration". Return the
+    upper adjacency of the collapsed 1-skeleton.
+
+    Edges are visited in decreasing order of filtration value. An edge which
+    is dominated until some later value is shifted to it, and an edge which
+    stays dominated is removed. Each such step induces isomorphisms between
+    the (co)homology of the flag complexes at all filtration values, via the
+    inclusions of the new complexes in the old ones."""
+    nbrs_indptr, nbrs, nbr_edges = \
+        _symmetric_adjacency(n_vertices, indptr, indices)
+    rows = np.empty(len(indices), dtype=np.int64)
+    for i in range(n_vertices):
+        rows[indptr[i]:indptr[i + 1]] = i
+    new_edge_values = edge_values.copy()
+    for pos in np.argsort(edge_values, kind="mergesort")[::-1]:
+        new_edge_values[pos] = _first_undominated_value(
+            rows[pos], indices[pos], edge_values[pos], nbrs_indptr, nbrs,
+            nbr_edges, new_edge_values
+            )
+
+    kept = new_edge_values < np.inf
+    new_indptr = np.zeros(n_vertices + 1, dtype=np.int64)
+    for i in range(n_vertices):
+        new_indptr[i + 1] = new_indptr[i] + \
+            np.count_nonzero(kept[indptr[i]:indptr[i + 1]])
+
+    return new_indptr, indices[kept], new_edge_values[kept]
+
+
+@nb.njit(cache=True)
+def _edge_value(indptr, indices, edge_values, i, j):
+    """Value of the edge ``(i, j)``, ``i < j``, in an upper adjacency, or
+    ``-1.`` if the edge is absent."""
+    start, end = indptr[i], indptr[i + 1]
+    pos = start + np.searchsorted(indices[start:end], j)
+    if pos < end and indices[pos] == j:
+        return edge_values[pos]
+    return -1.
+
+
+@nb.njit(cache=True)
+def _flag_coface_value(spx, value, v, indptr, indices, edge_values):
+    """Value of the flag simplex ``spx + (v,)``, or ``-1.`` if it is absent."""
+    for x in spx[:-1]:
+        edge_value = _edge_value(indptr, indices, edge_values, x, v)
+        if edge_value < 0:
+            return -1.
+        value = max(value, edge_value)
+    return value
+
+
+@nb.njit(parallel=True, cache=True)
+def _flag_expansion_single_dim(tups_dim, values_dim, indptr, indices,
+                               edge_values):
+    """Cofaces of lexicographically sorted ``d``-simplices in a flag complex,
+    again in lexicographic order. Each ``d``-simplex is only extended by
+    vertices larger than its own."""
+    n_spx, len_tups_dim = tups_dim.shape
+    counts = np.zeros(n_spx + 1, dtype=np.int64)
+    for i in nb.prange(n_spx):
+        spx = tups_dim[i]
+        last = spx[-1]
+        for pos in range(indptr[last], indptr[last + 1]):
+            value = max(values_dim[i], edge_values[pos])
+            if _flag_coface_value(spx, value, indices[pos], indptr, indices,
+                                  edge_values) >= 0:
+                counts[i + 1] += 1
+    offsets = np.cumsum(counts)
+
+    tups_next_dim = np.empty((offsets[-1], len_tups_dim + 1), dtype=np.int64)
+    values_next_dim = np.empty(offsets[-1], dtype=np.float64)
+    for i in nb.prange(n_spx):
+        spx = tups_dim[i]
+        last = spx[-1]
+        j = offsets[i]
+        for pos in range(indptr[last], indptr[last + 1]):
+            v = indices[pos]
+            value = max(values_dim[i], edge_values[pos])
+            value = _flag_coface_value(spx, value, v, indptr, indices,
+                                       edge_values)
+            if value >= 0:
+                tups_next_dim[j, :-1] = spx
+                tups_next_dim[j, -1] = v
+                values_next_dim[j] = value
+                j += 1
+
+    return tups_next_dim, values_next_dim
+
+
+def _sort_flag_filtration(tups_by_dim, values_by_dim):
+    """Order simplices by filtration value, then by dimension, then
+    lexicographically, and organize them as in `sort_filtration_by_dim`."""
+    sizes = [len(values_dim) for values_dim in values_by_dim]
+    values = np.concatenate(values_by_dim)
+    dims = np.repeat(np.arange(len(sizes), dtype=np.int64), sizes)
+    order = np.lexsort((dims, values))
+    del dims
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order), dtype=np.int64)
+    filtration_values = values[order]
+    del order, values
+
+    filtration_by_dim = []
+    start = 0
+    for size, tups_dim in zip(sizes, tups_by_dim):
+        idxs_dim = ranks[start:start + size]
+        perm = np.argsort(idxs_dim, kind="stable")
+        filtration_by_dim.append([idxs_dim[perm], tups_dim[perm]])
+        start += size
+
+    return filtration_by_dim, filtration_values
+
+
+def rips_filtration(X, threshold=np.inf, maxdim=2, metric="euclidean",
+                    collapse_edges=False):
+    """Build a simplex-wise Vietoris–Rips filtration, organized by dimension.
+
+    Simplices are ordered by filtration value, then by dimension, then
+    lexicographically. The result can be passed to `barcodes` directly, which
+    avoids creating (and sorting) one Python tuple per simplex.
+
+    Parameters
+    ----------
+    X : ndarray
+        Either a 2D array of shape ``(n_points, n_features)`` representing a
+        point cloud in Euclidean space, or a 1D condensed distance matrix as
+        returned by ``scipy.spatial.distance.pdist``. A square distance matrix
+        can also be passed if `metric` is ``"precomputed"``.
+
+    threshold : float, optional, default: ``numpy.inf``
+        Maximum edge length to be included.
+
+    maxdim : int, optional, default: ``2``
+        Maximum simplex dimension to be included.
+
+    metric : ``"euclidean"`` | ``"precomputed"``, optional, default: \
+        ``"euclidean"``
+        Whether a 2D `X` is a point cloud or a square distance matrix. Ignored
+        if `X` is 1D.
+
+    collapse_edges : bool, optional, default: ``False``
+        Whether to apply filtered edge collapses to the 1-skeleton before
+        expanding it to a flag filtration. Edges are removed or moved to later
+        filtration values, which often shrinks the filtration by orders of
+        magnitude while preserving, in degrees below `maxdim`, the persistent
+        (co)homology and Steenrod barcodes expressed in filtration values.
+        Expressed in filtration indices, they change: pass
+        ``return_filtration_values=True`` to `barcodes`. Bars in degree
+        `maxdim` are not preserved, as they already depend on the truncation.
+
+    Returns
+    -------
+    filtration_by_dim : list of list of ndarray
+        For each dimension ``d``, a list of 2 aligned int arrays: the first is
+        a 1D array containing the (ordered) positional indices of all
+        ``d``-dimensional simplices in the filtration; the second is a 2D array
+        whose ``i``-th row is the (sorted) collection of vertices defining the
+        ``i``-th ``d``-dimensional simplex.
+
+    filtration_values : ndarray
+        1D float array of filtration values for each simplex in the filtration.
+
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 2 and metric == "precomputed":
+        X = X[np.triu_indices(len(X), k=1)]
+    elif X.ndim == 2 and metric != "euclidean":
+        raise ValueError(f"Unknown metric {metric}.")
+
+    if X.ndim == 1:
+        n_vertices = int(round((1 + np.sqrt(1 + 8 * len(X))) / 2))
+        if (n_vertices * (n_vertices - 1)) // 2 != len(X):
+            raise ValueError("`X` is not a valid condensed distance matrix.")
+        indptr, indices, edge_values = _rips_edges_from_distances(
+            X, n_vertices, threshold
+            )
+    else:
+        n_vertices = len(X)
+        indptr, indices, edge_values = \
+            _rips_edges_from_points(np.ascontiguousarray(X), threshold)
+    if collapse_edges and maxdim >= 1:
+        indptr, indices, edge_values = \
+            _collapse_edges(n_vertices, indptr, indices, edge_values)
+
+    tups_by_dim = [np.arange(n_vertices, dtype=np.int64).reshape(-1, 1)]
+    values_by_dim = [np.zeros(n_vertices, dtype=np.float64)]
+    if maxdim >= 1:
+        tups_by_dim.append(np.stack(
+            [np.repeat(np.arange(n_vertices, dtype=np.int64),
+                       np.diff(indptr)), indices], axis=1
+            ))
+        values_by_dim.append(edge_values)
+    for dim in range(1, maxdim):
+        tups_next_dim, values_next_dim = _flag_expansion_single_dim(
+            tups_by_dim[dim], values_by_dim[dim], indptr, indices, edge_values
+            )
+        tups_by_dim.append(tups_next_dim)
+        values_by_dim.append(values_next_dim)
+
+    return _sort_flag_filtration(tups_by_dim, values_by_dim)
+
+
+def _is_filtration_by_dim(filtration):
+    """Whether `filtration` is already organized as by
+    `sort_filtration_by_dim`."""
+    try:
+        first = filtration[0]
+        return len(first) == 2 and isinstance(first[0], np.ndarray)
+    except (TypeError, IndexError):
+        return False
+
+
+@nb.njit(cache=True)
+def _arena_reserve(data, starts, lens, used, live, needed):
+    """Make room for `needed` more entries at the end of an arena of columns,
+    by compacting it in place if at least half of it is garbage, and by
+    growing it otherwise."""
+    if used + needed <= len(data):
+        return data, used
+
+    if 2 * live <= used:
+        pos = 0
+        for j in np.argsort(starts):
+            start = starts[j]
+            starts[j] = pos
+            for x in range(start, start + lens[j]):
+                data[pos] = data[x]
+                pos += 1
+        used = pos
+        if used + needed <= len(data):
+            return data, used
+
+    new_data = np.empty(max(2 * len(data), used + needed), dtype=data.dtype)
+    new_data[:used] = data[:used]
+    return new_data, used
+
+
+# Working columns: a column being reduced is held as a bitset of uint64 words,
+# to which whole pivot columns are added in place, and is written back to its
+# arena once fully reduced. Its pivot only increases during the reduction, so
+# the lowest set bit is searched for from the word holding the previous one.
+_DE_BRUIJN = np.uint64(0x03F79D71B4CB0A89)
+_DE_BRUIJN_POSITIONS = np.empty(64, dtype=np.int64)
+_DE_BRUIJN_POSITIONS[[((int(_DE_BRUIJN) << i) % 2 ** 64) >> 58
+                      for i in range(64)]] = np.arange(64)
+
+
+@nb.njit(cache=True)
+def _bitset_add(bits, column):
+    """Add (mod 2) the entries of `column` to a working column."""
+    one = np.uint64(1)
+    for x in column:
+        bits[x >> 6] ^= one << np.uint64(x & 63)
+
+
+@nb.njit(cache=True)
+def _lowest_bit(word):
+    """Position of the lowest set bit of a nonzero uint64."""
+    lowest = word & (~word + np.uint64(1))
+    return _DE_BRUIJN_POSITIONS[(lowest * _DE_BRUIJN) >> np.uint64(58)]
+
+
+@nb.njit(cache=True)
+def _bitset_lowest(bits, first_word, last_word):
+    """Lowest entry of a working column whose entries lie in words
+    `first_word` to `last_word`, or ``-1`` if it is zero, together with the
+    word holding it."""
+    for w in range(first_word, last_word + 1):
+        if bits[w]:
+            return 64 * w + _lowest_bit(bits[w]), w
+    return -1, last_word + 1
+
+
+@nb.njit(cache=True)
+def _bitset_count(bits, first_word, last_word):
+    """Number of entries of a working column whose entries lie in words
+    `first_word` to `last_word`."""
+    m1 = np.uint64(0x5555555555555555)
+    m2 = np.uint64(0x3333333333333333)
+    m4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+    h01 = np.uint64(0x0101010101010101)
+    length = 0
+    for w in range(first_word, last_word + 1):
+        x = bits[w]
+        x -= (x >> np.uint64(1)) & m1
+        x = (x & m2) + ((x >> np.uint64(2)) & m2)
+        x = (x + (x >> np.uint64(4))) & m4
+        length += np.int64((x * h01) >> np.uint64(56))
+
+    return length
+
+
+@nb.njit(cache=True)
+def _bitset_drain(bits, first_word, last_word, out):
+    """Write the sorted entries of a working column whose entries lie in words
+    `first_word` to `last_word` to `out`, and clear it."""
+    pos = 0
+    for w in range(first_word, last_word + 1):
+        word = bits[w]
+        while word:
+            out[pos] = 64 * w + _lowest_bit(word)
+            pos += 1
+            word &= word - np.uint64(1)
+        bits[w] = 0
+
+
+@nb.njit(cache=True)
+def _arena_store_bitset(data, starts, lens, used, live, j, bits, first_word,
+                        last_word):
+    """Store a working column whose entries lie in words `first_word` to
+    `last_word` as column `j` of an arena, and clear it."""
+    length = _bitset_count(bits, first_word, last_word)
+    data, used = _arena_reserve(data, starts, lens, used, live, length)
+    _bitset_drain(bits, first_word, last_word, data[used:used + length])
+    live += length - lens[j]
+    starts[j] = used
+    lens[j] = length
+
+    return data, used + length, live
+
+
+@nb.njit(cache=True)
+def _compress_columns(data, starts, lens):
+    """Copy the columns of an arena into a compact CSR-like pair
+    ``(indptr, indices)``."""
+    indptr = np.zeros(len(lens) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(lens)
+    indices = np.empty(indptr[-1], dtype=data.dtype)
+    for j in range(len(lens)):
+        indices[indptr[j]:indptr[j + 1]] = \
+            data[starts[j]:starts[j] + lens[j]]
+
+    return indptr, indices
+
+
+@nb.njit(cache=True)
 def _twist_reduction(coboundary, triangular, pivots_lookup):
     """Core of the persistent relative cohomology reduction algorithm using the
-    clearing optimization."""
-    n = len(coboundary)
+    clearing optimization. `coboundary` and `triangular` are arenas of columns
+    given as ``(data, starts, lens)`` triples.
+
+    Columns whose pivot is still free when they are reached (emergent pairs,
+    including all apparent pairs) are paired with it without being read
+    further or written.
+
+    Also return the number of column additions performed."""
+    r_data, r_starts, r_lens = coboundary
+    v_data, v_starts, v_lens = triangular
+    n = len(r_starts)
+    # Arenas may start with garbage, e.g. from cleared columns, until they are
+    # compacted
+    r_used = len(r_data)
+    r_live = np.sum(r_lens)
+    v_used = len(v_data)
+    v_live = np.sum(v_lens)
+    n_additions = 0
 
     rel_idxs_to_clear = []
+    r_bits = np.zeros((len(pivots_lookup) + 63) // 64, dtype=np.uint64)
+    v_bits = np.zeros((n + 63) // 64, dtype=np.uint64)
     for j in range(n - 1, -1, -1):
-        highest_one = coboundary[j][0] if coboundary[j] else -1
+        if not r_lens[j]:
+            continue
+        highest_one = r_data[r_starts[j]]
         pivot_col = pivots_lookup[highest_one]
-        while (highest_one != -1) and (pivot_col != -1):
-            coboundary[j] = _symm_diff(coboundary[j][1:],
-                                       coboundary[pivot_col][1:])
-            triangular[j] = _symm_diff(triangular[j],
-                                       triangular[pivot_col])
-            highest_one = coboundary[j][0] if coboundary[j] else -1
-            pivot_col = pivots_lookup[highest_one]
+        if pivot_col != -1:
+            # Reduce column j in working columns, and write it back once
+            r_col = r_data[r_starts[j]:r_starts[j] + r_lens[j]]
+            v_col = v_data[v_starts[j]:v_starts[j] + v_lens[j]]
+            _bitset_add(r_bits, r_col)
+            _bitset_add(v_bits, v_col)
+            r_first, r_last = highest_one >> 6, r_col[-1] >> 6
+            v_first, v_last = v_col[0] >> 6, v_col[-1] >> 6
+            while pivot_col != -1:
+                r_col = r_data[r_starts[pivot_col]:
+                               r_starts[pivot_col] + r_lens[pivot_col]]
+                v_col = v_data[v_starts[pivot_col]:
+                               v_starts[pivot_col] + v_lens[pivot_col]]
+                _bitset_add(r_bits, r_col)
+                _bitset_add(v_bits, v_col)
+                r_last = max(r_last, r_col[-1] >> 6)
+                v_first = min(v_first, v_col[0] >> 6)
+                v_last = max(v_last, v_col[-1] >> 6)
+                n_additions += 1
+                highest_one, r_first = _bitset_lowest(r_bits, r_first, r_last)
+                pivot_col = pivots_lookup[highest_one] \
+                    if highest_one != -1 else -1
+            r_data, r_used, r_live = _arena_store_bitset(
+                r_data, r_starts, r_lens, r_used, r_live, j, r_bits, r_first,
+                r_last
+                )
+            v_data, v_used, v_live = _arena_store_bitset(
+                v_data, v_starts, v_lens, v_used, v_live, j, v_bits, v_first,
+                v_last
+                )
         if highest_one != -1:
             pivots_lookup[highest_one] = j
             rel_idxs_to_clear.append(highest_one)
 
-    return np.asarray(rel_idxs_to_clear, dtype=np.int64)
-
-
-@lru_cache
-def _reduce_single_dim(dim):
-    len_tups_dim = dim + 1
-    tuple_typ_dim = nb.types.UniTuple(nb.int64, len_tups_dim)
-    len_tups_next_dim = dim + 2
-
-    @nb.njit
-    def _inner_reduce_single_dim(idxs_dim, tups_dim, rel_idxs_to_clear,
-                                 idxs_next_dim=None, tups_next_dim=None):
-        """R = MV"""
-        # 1) Construct sp2idx_dim as a dict simplex: relative (i.e.
-        # in-dimension) index
-        # 2) Initialize type of reduced_dim (needed for type inference)
-        # 3) Construct triangular_dim, with entries denoting relative (i.e.
-        # in-dimension) indices
-        spx2idx_dim = nb.typed.Dict.empty(tuple_typ_dim, nb.int64)
-        reduced_dim = nb.typed.List.empty_list(list_of_int64_typ)
-        triangular_dim = nb.typed.List.empty_list(list_of_int64_typ)
-        for i in range(len(idxs_dim)):
-            spx = to_fixed_tuple(tups_dim[i], len_tups_dim)
-            spx2idx_dim[spx] = i
-            reduced_dim.append([nb.int64(x) for x in range(0)])
-            triangular_dim.append([i])
-
-        # Populate reduced_dim as the coboundary matrix and apply clearing
-        # WARNING: Column entries denote relative (i.e. in-dimension) indices!
-        if idxs_next_dim is not None:
-            for j in range(len(idxs_next_dim)):
-                spx = to_fixed_tuple(tups_next_dim[j], len_tups_next_dim)
-                for face in _drop_elements(spx):
-                    reduced_dim[spx2idx_dim[face]].append(j)
-
-            for rel_idx in rel_idxs_to_clear:
-                reduced_dim[rel_idx] = [nb.int64(x) for x in range(0)]
-
-            pivots_lookup = np.full(len(idxs_next_dim), -1, dtype=np.int64)
-
-            rel_idxs_to_clear = _twist_reduction(reduced_dim, triangular_dim,
-                                                 pivots_lookup)
+    return (_compress_columns(r_data, r_starts, r_lens),
+            _compress_columns(v_data, v_starts, v_lens),
+            np.asarray(rel_idxs_to_clear, dtype=np.int64),
+            n_additions)
+
+
+@nb.njit(cache=True)
+def _reduce_chunk(coboundary, lo, hi, m, r_starts, r_lens, v_starts, v_lens):
+    """Reduce columns `lo` to ``hi - 1`` of a coboundary matrix, given as an
+    arena, by adding to each of them only columns of the same chunk which own
+    its pivot. The modified columns of R and V are stored in new arenas,
+    returned together with the number of column additions performed;
+    `r_starts`, `r_lens`, `v_starts` and `v_lens` hold their positions, and
+    are indexed relative to `lo`."""
+    data, starts, lens = coboundary
+    r_data = np.empty(64, dtype=data.dtype)
+    r_used = r_live = 0
+    v_data = np.empty(64, dtype=data.dtype)
+    v_used = v_live = 0
+    local_pivots = nb.typed.Dict.empty(key_type=nb.types.int64,
+                                       value_type=nb.types.int64)
+    r_bits = np.zeros((m + 63) // 64, dtype=np.uint64)
+    v_bits = np.zeros((hi + 63) // 64, dtype=np.uint64)
+    singleton = np.empty(1, dtype=data.dtype)
+    n_additions = 0
+
+    for j in range(hi - 1, lo - 1, -1):
+        if not lens[j]:
+            continue
+        r_col = data[starts[j]:starts[j] + lens[j]]
+        highest_one = r_col[0]
+        pivot_col = local_pivots[highest_one] \
+            if highest_one in local_pivots else -1
+        if pivot_col != -1:
+            _bitset_add(r_bits, r_col)
+            singleton[0] = j
+            _bitset_add(v_bits, singleton)
+            r_first, r_last = highest_one >> 6, r_col[-1] >> 6
+            v_first, v_last = j >> 6, j >> 6
+            while pivot_col != -1:
+                i = pivot_col - lo
+                if v_lens[i]:
+                    r_col = r_data[r_starts[i]:r_starts[i] + r_lens[i]]
+                    v_col = v_data[v_starts[i]:v_starts[i] + v_lens[i]]
+                else:
+                    r_col = data[starts[pivot_col]:
+                                 starts[pivot_col] + lens[pivot_col]]
+                    singleton[0] = pivot_col
+                    v_col = singleton
+                _bitset_add(r_bits, r_col)
+                _bitset_add(v_bits, v_col)
+                r_last = max(r_last, r_col[-1] >> 6)
+                v_last = max(v_last, v_col[-1] >> 6)
+                n_additions += 1
+                highest_one, r_first = _bitset_lowest(r_bits, r_first, r_last)
+                pivot_col = local_pivots[highest_one] \
+                    if highest_one in local_pivots else -1
+            r_data, r_used, r_live = _arena_store_bitset(
+                r_data, r_starts, r_lens, r_used, r_live, j - lo, r_bits,
+                r_first, r_last
+                )
+            v_data, v_used, v_live = _arena_store_bitset(
+                v_data, v_starts, v_lens, v_used, v_live, j - lo, v_bits,
+                v_first, v_last
+                )
+        if highest_one != -1:
+            local_pivots[highest_one] = j
+
+    return r_data, v_data, n_additions
+
+
+@nb.njit(parallel=True, cache=True, nogil=True)
+def _chunked_twist_reduction(coboundary, pivots_lookup, n_jobs):
+    """Same as `_twist_reduction`, but starting with a local reduction of
+    `n_jobs` chunks of consecutive columns in parallel, each of them only
+    using columns from the same chunk, as in the chunk algorithm of Bauer,
+    Kerber and Reininghaus ("Clear and compress: computing persistent
+    homology in chunks"). What is left is done by a sequential pass over all
+    columns. V is initialized as the identity."""
+    data, starts, lens = coboundary
+    n = len(starts)
+    bounds = np.array([(n * chunk) // n_jobs for chunk in range(n_jobs + 1)],
+                      dtype=np.int64)
+    # Positions of the modified columns in the arenas of their chunks. A
+    # modified column of V is never empty, and marks a modified column
+    r_starts = np.zeros(n, dtype=np.int64)
+    r_lens = np.zeros(n, dtype=np.int64)
+    v_starts = np.zeros(n, dtype=np.int64)
+    v_lens = np.zeros(n, dtype=np.int64)
+    r_chunks = nb.typed.List([np.empty(0, dtype=data.dtype)
+                              for _ in range(n_jobs)])
+    v_chunks = nb.typed.List([np.empty(0, dtype=data.dtype)
+                              for _ in range(n_jobs)])
+    n_additions_chunks = np.zeros(n_jobs, dtype=np.int64)
+    for chunk in nb.prange(n_jobs):
+        lo, hi = bounds[chunk], bounds[chunk + 1]
+        r_chunks[chunk], v_chunks[chunk], n_additions_chunks[chunk] = \
+            _reduce_chunk(coboundary, lo, hi, len(pivots_lookup),
+                          r_starts[lo:hi], r_lens[lo:hi], v_starts[lo:hi],
+                          v_lens[lo:hi])
+
+    # Append the modified columns to the arenas of the sequential pass
+    modified = v_lens > 0
+    r_data = np.empty(len(data) + np.sum(r_lens[modified]), dtype=data.dtype)
+    r_data[:len(data)] = data
+    v_data = np.empty(n + np.sum(v_lens[modified]), dtype=data.dtype)
+    v_data[:n] = np.arange(n)
+    new_starts = starts.copy()
+    new_lens = lens.copy()
+    new_v_starts = np.arange(n)
+    new_v_lens = np.ones(n, dtype=np.int64)
+    r_used = len(data)
+    v_used = n
+    for chunk in range(n_jobs):
+        r_chunk, v_chunk = r_chunks[chunk], v_chunks[chunk]
+        for j in range(bounds[chunk], bounds[chunk + 1]):
+            if not modified[j]:
+                continue
+            r_data[r_used:r_used + r_lens[j]] = \
+                r_chunk[r_starts[j]:r_starts[j] + r_lens[j]]
+            new_starts[j] = r_used
+            new_lens[j] = r_lens[j]
+            r_used += r_lens[j]
+            v_data[v_used:v_used + v_lens[j]] = \
+                v_chunk[v_starts[j]:v_starts[j] + v_lens[j]]
+            new_v_starts[j] = v_used
+            new_v_lens[j] = v_lens[j]
+            v_used += v_lens[j]
+
+    reduced, triangular, rel_idxs_to_clear, n_additions = _twist_reduction(
+        (r_data, new_starts, new_lens), (v_data, new_v_starts, new_v_lens),
+        pivots_lookup
+        )
+
+    return (reduced, triangular, rel_idxs_to_clear,
+            n_additions + np.sum(n_additions_chunks))
+
+
+@nb.njit(cache=True)
+def _identity_columns(n, dtype):
+    """Arena holding the columns of the ``n x n`` identity matrix, with
+    entries of integer type `dtype`."""
+    return (np.arange(n, dtype=dtype),
+            np.arange(n, dtype=np.int64),
+            np.ones(n, dtype=np.int64))
+
+
+def _index_dtype(filtration_by_dim):
+    """Narrowest of int32 and int64 holding the relative (i.e. in-dimension)
+    indices of all simplices in a filtration organized by dimension. Entries
+    of R and V and pivot lookups are stored with it, so that the reduction
+    moves half as much memory when there are fewer than ``2 ** 31``
+    simplices in each dimension."""
+    n_max = max(len(idxs_dim) for idxs_dim, _ in filtration_by_dim)
+    if n_max <= np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+
+def _binomial_table(n_vertices, max_len):
+    """Binomial coefficients ``C(v, r)`` for ``v <= n_vertices`` and ``r <=
+    max_len``, as needed to compute combinatorial number system (CNS) keys of
+    simplices with at most `max_len` vertices."""
+    max_key = max(comb(n_vertices, r) for r in range(max_len + 1))
+    if max_key > np.iinfo(np.int64).max:
+        raise ValueError(
+            f"Combinatorial number system keys of simplices with up to "
+            f"{max_len} vertices out of {n_vertices} overflow int64."
+            )
+    binomials = np.zeros((n_vertices + 1, max_len + 1), dtype=np.int64)
+    binomials[:, 0] = 1
+    for r in range(1, max_len + 1):
+        binomials[1:, r] = np.cumsum(binomials[:-1, r - 1])
+
+    return binomials
+
+
+@nb.njit(cache=True, nogil=True)
+def _simplex_keys(tups, binomials):
+    """CNS keys of the (sorted) simplices in the rows of `tups`."""
+    keys = np.zeros(len(tups), dtype=np.int64)
+    for i in range(len(tups)):
+        for r in range(tups.shape[1]):
+            keys[i] += binomials[tups[i, r], r + 1]
+
+    return keys
+
+
+def _simplex_index(tups_dim, n_vertices):
+    """Integer index of the (sorted) simplices in the rows of `tups_dim`, for
+    lookups with `_find_simplex`. Vertices are labelled by integers smaller
+    than `n_vertices`, if it is not ``None``.
+
+    The index is a triple ``(keys, order, binomials)``. When `n_vertices` is
+    not ``None`` and the combinatorial number system (CNS) keys of the
+    simplices fit in int64, ``keys`` are the sorted keys and ``order`` the
+    permutation sorting them. Otherwise, ``keys`` and ``binomials`` are empty
+    and ``order`` sorts the rows of `tups_dim` lexicographically."""
+    binomials = None
+    if n_vertices is not None:
+        try:
+            binomials = _binomial_table(n_vertices, tups_dim.shape[1])
+        except ValueError:
+            pass
+    if binomials is None:
+        order = np.lexsort(tups_dim.T[::-1])
+        return (np.empty(0, dtype=np.int64), order,
+                np.empty((0, 0), dtype=np.int64))
+    keys = _simplex_keys(tups_dim, binomials)
+    order = np.argsort(keys)
+
+    return keys[order], order, binomials
+
+
+@nb.njit(cache=True)
+def _find_simplex(spx, index, tups):
+    """Relative (i.e. in-dimension) index of the (sorted) simplex `spx` in the
+    rows of `tups`, or -1 if absent. `index` is as returned by
+    `_simplex_index`."""
+    keys, order, binomials = index
+    if len(binomials):
+        key = 0
+        for r in range(len(spx)):
+            key += binomials[spx[r], r + 1]
+        i = np.searchsorted(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return order[i]
+        return -1
+
+    lo, hi = 0, len(order)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        row = tups[order[mid]]
+        sign = 0
+        for r in range(len(spx)):
+            if row[r] != spx[r]:
+                sign = -1 if row[r] < spx[r] else 1
+                break
+        if not sign:
+            return order[mid]
+        if sign < 0:
+            lo = mid + 1
+        else:
+            hi = mid
+    return -1
+
+
+@nb.njit(cache=True)
+def _facets(spx, index, tups, out):
+    """Write the relative (i.e. in-dimension) indices of the facets of `spx`,
+    looked up in the rows of `tups` via `index`, to `out`."""
+    keys, order, binomials = index
+    face = np.empty(len(spx) - 1, dtype=np.int64)
+    for x in range(len(spx)):
+        if len(binomials):
+            # CNS key of the facet, computed in place
+            key = 0
+            for r in range(x):
+                key += binomials[spx[r], r + 1]
+            for r in range(x + 1, len(spx)):
+                key += binomials[spx[r], r]
+            i = np.searchsorted(keys, key)
+            i = order[i] if i < len(keys) and keys[i] == key else -1
+        else:
+            face[:x] = spx[:x]
+            face[x:] = spx[x + 1:]
+            i = _find_simplex(face, index, tups)
+        if i == -1:
+            raise ValueError("The filtration is not closed under taking faces.")
+        out[x] = i
+
+
+@nb.njit(cache=True, nogil=True)
+def _coboundary_single_dim(tups_dim, index_dim, tups_next_dim, dtype):
+    """Coboundary matrix of the ``d``-simplices in the rows of `tups_dim`, as
+    an arena of columns whose entries denote relative (i.e. in-dimension)
+    indices of ``(d+1)``-simplices and are of integer type `dtype`."""
+    n = len(tups_dim)
+    m = len(tups_next_dim)
+    facets = np.empty(tups_next_dim.shape[1], dtype=np.int64)
+    lens = np.zeros(n, dtype=np.int64)
+    for j in range(m):
+        _facets(tups_next_dim[j], index_dim, tups_dim, facets)
+        for i in facets:
+            lens[i] += 1
+    starts = np.zeros(n, dtype=np.int64)
+    starts[1:] = np.cumsum(lens[:-1])
+    data = np.empty(np.sum(lens), dtype=dtype)
+    ends = starts.copy()
+    for j in range(m):
+        _facets(tups_next_dim[j], index_dim, tups_dim, facets)
+        for i in facets:
+            data[ends[i]] = j
+            ends[i] += 1
+
+    return data, starts, lens
+
+
+@nb.njit(cache=True, nogil=True)
+def _reduce_single_dim(coboundary_dim, n_next_dim, rel_idxs_to_clear,
+                       n_chunks):
+    """R = MV, starting from the coboundary matrix as returned by
+    `_coboundary_single_dim`, which is modified in place and has
+    `n_next_dim` rows. If `n_chunks` is greater than 1, use
+    `_chunked_twist_reduction` with that many threads."""
+    # Apply clearing. triangular_dim is initialized as the identity, with
+    # entries denoting relative (i.e. in-dimension) indices
+    data, starts, lens = coboundary_dim
+    lens[rel_idxs_to_clear] = 0
+
+    pivots_lookup = np.full(n_next_dim, -1, dtype=data.dtype)
+
+    if n_chunks > 1:
+        reduced_dim, triangular_dim, rel_idxs_to_clear, n_additions = \
+            _chunked_twist_reduction(coboundary_dim, pivots_lookup, n_chunks)
+    else:
+        reduced_dim, triangular_dim, rel_idxs_to_clear, n_additions = \
+            _twist_reduction(coboundary_dim,
+                             _identity_columns(len(starts), data.dtype),
+                             pivots_lookup)
+
+    return (reduced_dim, triangular_dim, rel_idxs_to_clear, pivots_lookup,
+            n_additions)
+
+
+@nb.njit(cache=True)
+def _symm_diff_arrays(x, i, n, y, j, m, out):
+    """Write the symmetric difference of the sorted ``x[i:n]`` and ``y[j:m]``
+    to `out` (which must be large enough), and return its length."""
+    k = 0
+    while (i < n) and (j < m):
+        if x[i] < y[j]:
+            out[k] = x[i]
+            i += 1
+            k += 1
+        elif y[j] < x[i]:
+            out[k] = y[j]
+            j += 1
+            k += 1
         else:
-            pivots_lookup = np.empty(0, dtype=np.int64)
+            i += 1
+            j += 1
 
-        return (spx2idx_dim, reduced_dim, triangular_dim,
-                rel_idxs_to_clear, pivots_lookup)
+    while i < n:
+        out[k] = x[i]
+        i += 1
+        k += 1
+
+    while j < m:
+        out[k] = y[j]
+        j += 1
+        k += 1
 
-    return _inner_reduce_single_dim
+    return k
 
 
-@nb.njit
+@nb.njit(cache=True, nogil=True)
 def _fix_triangular_after_clearing(triangular, reduced_prev_dim,
                                    rel_idxs_to_clear, pivots_lookup_prev_dim):
     """Massage the V matrix to maintain the R = DV decomposition after clearing,
     as described in https://arxiv.org/abs/1908.02518, Sec. 3.2."""
+    if not len(rel_idxs_to_clear):
+        return triangular
+
+    indptr, indices = triangular
+    indptr_prev_dim, indices_prev_dim = reduced_prev_dim
+    n = len(indptr) - 1
+    sources = np.full(n, -1, dtype=np.int64)
+    lens = indptr[1:] - indptr[:-1]
     for rel_idx in rel_idxs_to_clear:
-        triangular[rel_idx] = reduced_prev_dim[pivots_lookup_prev_dim[rel_idx]]
+        col = pivots_lookup_prev_dim[rel_idx]
+        sources[rel_idx] = col
+        lens[rel_idx] = indptr_prev_dim[col + 1] - indptr_prev_dim[col]
+
+    new_indptr = np.zeros(n + 1, dtype=np.int64)
+    new_indptr[1:] = np.cumsum(lens)
+    new_indices = np.empty(new_indptr[-1], dtype=indices.dtype)
+    for j in range(n):
+        col = sources[j]
+        if col == -1:
+            new_indices[new_indptr[j]:new_indptr[j + 1]] = \
+                indices[indptr[j]:indptr[j + 1]]
+        else:
+            new_indices[new_indptr[j]:new_indptr[j + 1]] = \
+                indices_prev_dim[indptr_prev_dim[col]:indptr_prev_dim[col + 1]]
+
+    return new_indptr, new_indices
 
 
-def get_reduced_triangular(filtration_by_dim):
+def get_reduced_triangular(filtration_by_dim, n_jobs=1, chunked=False,
+                           dims=None, stats=None):
     """Find a full-rank upper-triangular matrix V such that R = DV is reduced,
     where D is the anti-transpose of the filtration boundary matrix. Return both
     R and V.
@@ -150,79 +1169,249 @@ def get_reduced_triangular(filtration_by_dim):
         whose ``i``-th row is the (sorted) collection of vertices defining the
         ``i``-th ``d``-dimensional simplex.
 
+    n_jobs : int, optional, default: ``1``
+        Number of threads used to build the simplex indices and the
+        coboundary matrices of all dimensions.
+        These do not depend on the reduction in lower dimensions, so they are
+        built concurrently with it, while the reduction itself proceeds one
+        dimension at a time. ``-1`` means using all available physical cores.
+        With more than one thread, coboundary matrices may be built ahead of
+        their use and held in memory at the same time.
+
+    chunked : bool, optional, default: ``False``
+        If ``True`` and `n_jobs` is greater than 1, the reduction in each
+        dimension is itself parallelized with the chunk algorithm: the columns
+        are split into `n_jobs` chunks of consecutive columns, each of which
+        is first reduced by one thread using only columns from the same
+        chunk, and a sequential pass over all columns finishes the reduction.
+        The barcode is the same, but R and V (and hence the cocycle
+        representatives) may differ from those computed sequentially.
+
+    dims : iterable of int or None, optional, default: None
+        If not ``None``, the dimensions whose parts of R and V are needed.
+        Only the dimensions from the lowest to the highest of them are then
+        reduced, the lowest one without clearing: this leaves its nonzero
+        columns of R unchanged, but not its columns of V. The parts of R and
+        V in all other dimensions are ``None``, and so are the simplex
+        indices except in the reduced dimensions and in the one above them.
+
+    stats : dict or None, optional, default: None
+        If a dict, it is populated with the following lists, holding one
+        entry per simplex dimension ``d`` (zero if ``d`` is not reduced, see
+        `dims`):
+
+        - ``"n_simplices"``: number of ``d``-simplices;
+        - ``"n_cleared"``: number of columns of ``reduced[d]`` zeroed by the
+          clearing optimization;
+        - ``"n_column_additions"``: number of column additions performed by
+          the reduction;
+        - ``"nnz_reduced"`` and ``"nnz_triangular"``: number of nonzero
+          entries of ``reduced[d]`` and ``triangular[d]``, i.e. the fill-in.
+
     Returns
     -------
-    spx2idx : tuple of ``numba.typed.Dict``
-        One dictionary per simplex dimension. The dimension-``d`` dictionary has
-        the filtration ``d``-simplices (tuples of ints) as keys; the
-        corresponding values are the positional indices of those simplices
-        relative to the ``d``-dimensional portion of the filtration.
+    simplex_index : tuple of tuple of ndarray
+        One index per simplex dimension, for looking up the positional indices
+        of ``d``-simplices relative to the ``d``-dimensional portion of the
+        filtration. ``simplex_index[d]`` is a triple ``(keys, order,
+        binomials)``: when the largest vertex label is less than twice the
+        number of vertices and the combinatorial number system (CNS) keys of
+        ``d``-simplices fit in int64, ``keys`` holds them in sorted order and
+        ``order`` is the permutation sorting them; otherwise, ``keys`` and
+        ``binomials`` are empty and ``order`` sorts the simplices
+        lexicographically.
 
     idxs : tuple of ndarray
         For each dimension ``d``, this is the same as
         ``filtration_by_dim[d][0]`` and is returned for convenience.
 
-    reduced : tuple of ``numba.typed.List``
-        One list of int per simplex dimension. ``reduced[d]`` is the
+    reduced : tuple of tuple of ndarray
+        One sparse matrix per simplex dimension, as a pair ``(indptr,
+        indices)`` of int arrays: column ``i`` consists of the entries
+        ``indices[indptr[i]:indptr[i + 1]]``. ``indices`` is int32 if there
+        are fewer than ``2 ** 31`` simplices in each dimension, and int64
+        otherwise; ``indptr`` is int64. ``reduced[d]`` is the
         ``d``-dimensional part of the "R" matrix in R = DV. In the computation,
-        ``reduced[d][i]`` is initialized as the coboundary of the ``i``th input
-        simplex in ``filtration_by_dim[d][1]``, i.e. as the sorted list of
-        positional indices (relative to the ``(d+1)``-dimensional portion of the
-        filtration) of that simplex's cofacets.
+        column ``i`` of ``reduced[d]`` is initialized as the coboundary of the
+        ``i``th input simplex in ``filtration_by_dim[d][1]``, i.e. as the sorted
+        positional indices (relative to the ``(d+1)``-dimensional portion of
+        the filtration) of that simplex's cofacets.
 
-    triangular : tuple of ``numba.typed.List``
-        On list of int per simplex dimension. ``triangular[d]`` is the
-        ``d``-dimensional part of the "V" matrix in R = DV. In the computation,
-        ``triangular[d][i]`` is initialized as the singleton list ``[i]``.
+    triangular : tuple of tuple of ndarray
+        One sparse matrix per simplex dimension, in the same format as
+        `reduced`. ``triangular[d]`` is the ``d``-dimensional part of the "V"
+        matrix in R = DV. In the computation, column ``i`` of
+        ``triangular[d]`` is initialized as ``[i]``.
 
     """
+    if n_jobs == -1:
+        n_jobs = N_PHYSICAL_CORES
+    n_chunks = n_jobs if chunked else 1
     maxdim = len(filtration_by_dim) - 1
-    spx2idx_idxs_reduced_triangular = []
-    # Initialize relative (i.e. in-dimension) indices to clear, as an empty
-    # int array in dim 0
-    rel_idxs_to_clear = np.empty(0, dtype=np.int64)
-    reduced_prev_dim = nb.typed.List.empty_list(list_of_int64_typ)
-    pivots_lookup_prev_dim = np.empty(0, dtype=np.int64)
-    for dim in range(maxdim):
-        reduction_dim = _reduce_single_dim(dim)
-        idxs_dim, tups_dim = filtration_by_dim[dim]
-        idxs_next_dim, tups_next_dim = filtration_by_dim[dim + 1]
-        (spx2idx_dim, reduced_dim, triangular_dim,
-         rel_idxs_to_clear_next_dim, pivots_lookup) = \
-            reduction_dim(idxs_dim,
-                          tups_dim,
-                          rel_idxs_to_clear,
-                          idxs_next_dim=idxs_next_dim,
-                          tups_next_dim=tups_next_dim)
-        _fix_triangular_after_clearing(triangular_dim,
-                                       reduced_prev_dim,
-                                       rel_idxs_to_clear,
-                                       pivots_lookup_prev_dim)
-        spx2idx_idxs_reduced_triangular.append((spx2idx_dim,
-                                                idxs_dim,
-                                                reduced_dim,
-                                                triangular_dim))
-        rel_idxs_to_clear = rel_idxs_to_clear_next_dim
-        reduced_prev_dim = reduced_dim
-        pivots_lookup_prev_dim = pivots_lookup
-
-    reduction_dim = _reduce_single_dim(maxdim)
-    idxs_dim, tups_dim = filtration_by_dim[maxdim]
-    spx2idx_dim, reduced_dim, triangular_dim, _, _ = \
-        reduction_dim(idxs_dim, tups_dim, rel_idxs_to_clear)
-    _fix_triangular_after_clearing(triangular_dim,
-                                   reduced_prev_dim,
-                                   rel_idxs_to_clear,
-                                   pivots_lookup_prev_dim)
-    spx2idx_idxs_reduced_triangular.append((spx2idx_dim,
-                                            idxs_dim,
-                                            reduced_dim,
-                                            triangular_dim))
-
-    return tuple(zip(*spx2idx_idxs_reduced_triangular))
-
-
-@nb.njit
+    dtype = _index_dtype(filtration_by_dim)
+    if dims is None:
+        lowest_dim, highest_dim = 0, maxdim
+    else:
+        dims = sorted(set(dims))
+        if not dims or dims[0] < 0 or dims[-1] > maxdim:
+            raise ValueError(f"`dims` must be a nonempty collection of "
+                             f"dimensions between 0 and {maxdim}.")
+        lowest_dim, highest_dim = dims[0], dims[-1]
+    # Coboundaries in the top reduced dimension are looked up in the index of
+    # the dimension above it
+    indexed_dims = range(lowest_dim, min(highest_dim + 1, maxdim) + 1)
+    n_vertices = int(max(filtration_by_dim[dim][1].max(initial=-1)
+                         for dim in indexed_dims)) + 1
+    # CNS keys need one row of binomials per vertex label, so sparse labels
+    # are indexed lexicographically instead
+    if n_vertices > 2 * len(filtration_by_dim[0][0]):
+        n_vertices = None
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        simplex_index = [None] * (maxdim + 1)
+        simplex_index[lowest_dim:indexed_dims[-1] + 1] = executor.map(
+            lambda dim: _simplex_index(filtration_by_dim[dim][1], n_vertices),
+            indexed_dims
+            )
+        simplex_index = tuple(simplex_index)
+        if n_jobs > 1:
+            # Coboundaries do not depend on clearing information: build them
+            # all ahead of the (sequential) reduction
+            coboundaries = {
+                dim: executor.submit(_coboundary_single_dim,
+                                     filtration_by_dim[dim][1],
+                                     simplex_index[dim],
+                                     filtration_by_dim[dim + 1][1], dtype)
+                for dim in range(lowest_dim, min(highest_dim, maxdim - 1) + 1)
+                }
+
+        idxs_reduced_triangular = [(idxs_dim, None, None)
+                                   for idxs_dim, _ in filtration_by_dim]
+        # Initialize relative (i.e. in-dimension) indices to clear, as an empty
+        # int array in the lowest reduced dimension
+        rel_idxs_to_clear = np.empty(0, dtype=np.int64)
+        reduced_prev_dim = (np.zeros(1, dtype=np.int64),
+                            np.empty(0, dtype=dtype))
+        pivots_lookup_prev_dim = np.empty(0, dtype=dtype)
+        n_cleared = [0] * (maxdim + 1)
+        n_column_additions = [0] * (maxdim + 1)
+        for dim in range(lowest_dim, highest_dim + 1):
+            idxs_dim, tups_dim = filtration_by_dim[dim]
+            n_additions = 0
+            if dim == maxdim:
+                reduced_dim = (np.zeros(len(idxs_dim) + 1, dtype=np.int64),
+                               np.empty(0, dtype=dtype))
+                triangular_dim = _compress_columns(
+                    *_identity_columns(len(idxs_dim), dtype)
+                    )
+            else:
+                if n_jobs > 1:
+                    coboundary_dim = coboundaries.pop(dim).result()
+                else:
+                    coboundary_dim = _coboundary_single_dim(
+                        tups_dim, simplex_index[dim],
+                        filtration_by_dim[dim + 1][1], dtype
+                        )
+                (reduced_dim, triangular_dim, rel_idxs_to_clear_next_dim,
+                 pivots_lookup, n_additions) = \
+                    _reduce_single_dim(coboundary_dim,
+                                       len(filtration_by_dim[dim + 1][0]),
+                                       rel_idxs_to_clear, n_chunks)
+                del coboundary_dim
+            triangular_dim = _fix_triangular_after_clearing(
+                triangular_dim, reduced_prev_dim, rel_idxs_to_clear,
+                pivots_lookup_prev_dim
+                )
+            idxs_reduced_triangular[dim] = (idxs_dim, reduced_dim,
+                                            triangular_dim)
+            n_cleared[dim] = len(rel_idxs_to_clear)
+            n_column_additions[dim] = n_additions
+            if dim < maxdim:
+                rel_idxs_to_clear = rel_idxs_to_clear_next_dim
+                reduced_prev_dim = reduced_dim
+                pivots_lookup_prev_dim = pivots_lookup
+
+    if stats is not None:
+        stats["n_simplices"] = [len(idxs_dim)
+                                for idxs_dim, _ in filtration_by_dim]
+        stats["n_cleared"] = n_cleared
+        stats["n_column_additions"] = n_column_additions
+        stats["nnz_reduced"] = [
+            0 if reduced_dim is None else len(reduced_dim[1])
+            for _, reduced_dim, _ in idxs_reduced_triangular
+            ]
+        stats["nnz_triangular"] = [
+            0 if triangular_dim is None else len(triangular_dim[1])
+            for _, _, triangular_dim in idxs_reduced_triangular
+            ]
+
+    return (simplex_index,) + tuple(zip(*idxs_reduced_triangular))
+
+
+@nb.njit(cache=True)
+def _gather_columns(matrices, sources, cols):
+    """Gather columns ``cols[i]`` of ``matrices[sources[i]]`` into a new sparse
+    matrix in ``(indptr, indices)`` format."""
+    indptr = np.zeros(len(cols) + 1, dtype=np.int64)
+    for i in range(len(cols)):
+        matrix_indptr = matrices[sources[i]][0]
+        indptr[i + 1] = \
+            indptr[i] + matrix_indptr[cols[i] + 1] - matrix_indptr[cols[i]]
+    indices = np.empty(indptr[-1], dtype=matrices[0][1].dtype)
+    for i in range(len(cols)):
+        matrix_indptr, matrix_indices = matrices[sources[i]]
+        indices[indptr[i]:indptr[i + 1]] = \
+            matrix_indices[matrix_indptr[cols[i]]:matrix_indptr[cols[i] + 1]]
+
+    return indptr, indices
+
+
+@nb.njit(cache=True)
+def _barcode_and_coho_reps_single_dim(idxs_dim, idxs_prev_dim, reduced_dim,
+                                      reduced_prev_dim, triangular_dim,
+                                      filtration_values):
+    """Barcode and cohomology representatives in a single dimension, see
+    `get_barcode_and_coho_reps`. In dimension 0, `idxs_prev_dim` must be empty,
+    and `reduced_prev_dim` is then never read."""
+    indptr_dim = reduced_dim[0]
+    is_birth = np.zeros(len(idxs_dim), dtype=np.bool_)
+    pairs_dim = []
+    # Representatives are columns of R in the previous dimension (source 0)
+    # for finite bars, and of V in this dimension (source 1) otherwise
+    sources_dim = []
+    cols_dim = []
+    indptr_prev_dim, indices_prev_dim = reduced_prev_dim
+    for i in range(len(idxs_prev_dim)):
+        if indptr_prev_dim[i + 1] > indptr_prev_dim[i]:
+            rel_b = indices_prev_dim[indptr_prev_dim[i]]
+            b = idxs_dim[rel_b]
+            d = idxs_prev_dim[i]
+            is_birth[rel_b] = True
+            if filtration_values is None or \
+                    filtration_values[b] != filtration_values[d]:
+                pairs_dim.append([d, b])
+                sources_dim.append(0)
+                cols_dim.append(i)
+
+    for i in range(len(idxs_dim)):
+        if not is_birth[i]:
+            if indptr_dim[i + 1] == indptr_dim[i]:
+                pairs_dim.append([-1, idxs_dim[i]])
+                sources_dim.append(1)
+                cols_dim.append(i)
+
+    if not len(pairs_dim):
+        pairs_dim = np.empty((0, 2), dtype=np.int64)
+    else:
+        pairs_dim = np.asarray(pairs_dim)
+    lexsrt = _lexsort_barcode(pairs_dim)
+
+    return pairs_dim[lexsrt], _gather_columns(
+        (reduced_prev_dim, triangular_dim),
+        np.asarray(sources_dim, dtype=np.int64)[lexsrt],
+        np.asarray(cols_dim, dtype=np.int64)[lexsrt]
+        )
+
+
 def get_barcode_and_coho_reps(idxs, reduced, triangular,
                               filtration_values=None):
     """Extract the ordinary persistent relative cohomology barcode as well as
@@ -234,13 +1423,13 @@ def get_barcode_and_coho_reps(idxs, reduced, triangular,
         For each dimension ``d``, a 1D int array containing the (ordered)
         positional indices of all ``d``-dimensional simplices in the filtration.
 
-    reduced : tuple of ``numba.typed.List``
-        One list of int per simplex dimension, representing the
+    reduced : tuple of tuple of ndarray
+        One sparse matrix per simplex dimension, representing the
         ``d``-dimensional part of the "R" matrix in R = DV. In the same format
         as returned by `get_reduced_triangular`.
 
-    triangular : tuple of ``numba.typed.List``
-        One list of int per simplex dimension, representing the
+    triangular : tuple of tuple of ndarray
+        One sparse matrix per simplex dimension, representing the
         ``d``-dimensional part of the "V" matrix in R = DV. In the same format
         as returned by `get_reduced_triangular`.
 
@@ -259,162 +1448,468 @@ def get_barcode_and_coho_reps(idxs, reduced, triangular,
         Essential bars are represented by pairs with death equal to ``-1``. Bars
         are sorted in order of decreasing birth indices.
 
-    coho_reps : list of ``numba.typed.List``
-        For each dimension ``d``, a list of representatives of persistent
-        relative cohomology classes in degree ``d``. Each such representative is
+    coho_reps : list of tuple of ndarray
+        For each dimension ``d``, a sparse matrix in the same format as
+        `reduced` whose columns are representatives of persistent relative
+        cohomology classes in degree ``d``. Each such representative is
         represented as a list of positional indices relative to the
-        ``d``-dimensional portion of the filtration. ``coho_reps[d][j]``
-        corresponds to ``barcode[d][j]``.
+        ``d``-dimensional portion of the filtration. Column ``j`` of
+        ``coho_reps[d]`` corresponds to ``barcode[d][j]``.
+
+        Both are empty in the degrees ``d`` for which ``triangular[d]``,
+        ``reduced[d]`` or ``reduced[d - 1]`` is ``None`` (see `dims` in
+        `get_reduced_triangular`).
 
     """
     barcode = []
     coho_reps = []
 
-    if filtration_values is None:
-        pairs_0 = []
-        coho_reps_0 = []
-        for i in range(len(idxs[0])):
-            if not reduced[0][i]:
-                pairs_0.append([-1, idxs[0][i]])
-                coho_reps_0.append(triangular[0][i])
-        pairs_0 = np.asarray(pairs_0)
-        lexsrt = _lexsort_barcode(pairs_0)
-        barcode.append(pairs_0[lexsrt])
-        coho_reps.append(nb.typed.List([coho_reps_0[k] for k in lexsrt]))
-
-        for dim in range(1, len(idxs)):
-            all_birth_indices = set()
-            pairs_dim = []
-            coho_reps_dim = []
-            for i in range(len(idxs[dim - 1])):
-                if reduced[dim - 1][i]:
-                    b = idxs[dim][reduced[dim - 1][i][0]]
-                    d = idxs[dim - 1][i]
-                    pairs_dim.append([d, b])
-                    coho_reps_dim.append(reduced[dim - 1][i])
-                    all_birth_indices.add(b)
-
-            for i in range(len(idxs[dim])):
-                if idxs[dim][i] not in all_birth_indices:
-                    if not reduced[dim][i]:
-                        pairs_dim.append([-1, idxs[dim][i]])
-                        coho_reps_dim.append(triangular[dim][i])
-
-            if not len(pairs_dim):
-                pairs_dim = np.empty((0, 2), dtype=np.int64)
-            else:
-                pairs_dim = np.asarray(pairs_dim)
-            lexsrt = _lexsort_barcode(pairs_dim)
-            barcode.append(pairs_dim[lexsrt])
-            coho_reps.append(nb.typed.List([coho_reps_dim[k] for k in lexsrt]))
+    # NB: Looping over dimensions in Python keeps the jitted kernel generic in
+    # the number of dimensions, so that it is compiled (and cached) only once
+    for dim in range(len(idxs)):
+        if triangular[dim] is None or reduced[dim] is None or \
+                (dim and reduced[dim - 1] is None):
+            barcode.append(np.empty((0, 2), dtype=np.int64))
+            coho_reps.append((np.zeros(1, dtype=np.int64),
+                              np.empty(0, dtype=np.int64)))
+            continue
+        if dim:
+            idxs_prev_dim, reduced_prev_dim = idxs[dim - 1], reduced[dim - 1]
+        else:
+            idxs_prev_dim = idxs[dim][:0]
+            reduced_prev_dim = reduced[dim]
+        barcode_dim, coho_reps_dim = _barcode_and_coho_reps_single_dim(
+            idxs[dim], idxs_prev_dim, reduced[dim], reduced_prev_dim,
+            triangular[dim], filtration_values
+            )
+        barcode.append(barcode_dim)
+        coho_reps.append(coho_reps_dim)
+
+    return barcode, coho_reps
 
+
+@nb.njit(cache=True)
+def _n_common(x, y):
+    """Number of common entries of the sorted arrays `x` and `y`."""
+    i = j = n_common = 0
+    while i < len(x) and j < len(y):
+        if x[i] < y[j]:
+            i += 1
+        elif y[j] < x[i]:
+            j += 1
+        else:
+            n_common += 1
+            i += 1
+            j += 1
+
+    return n_common
+
+
+@nb.njit(cache=True)
+def _coboundary_columns(tups_dim, index_prev_dim, tups_prev_dim, dtype):
+    """Coboundary matrix from dimension ``d - 1`` to dimension ``d``, in
+    ``(indptr, indices)`` format with relative indices of integer type
+    `dtype`."""
+    n_prev = len(tups_prev_dim)
+    facets = np.empty(tups_dim.shape[1], dtype=np.int64)
+    indptr = np.zeros(n_prev + 1, dtype=np.int64)
+    for j in range(len(tups_dim)):
+        _facets(tups_dim[j], index_prev_dim, tups_prev_dim, facets)
+        for i in facets:
+            indptr[i + 1] += 1
+    indptr = np.cumsum(indptr)
+    indices = np.empty(indptr[-1], dtype=dtype)
+    ends = indptr[:-1].copy()
+    for j in range(len(tups_dim)):
+        _facets(tups_dim[j], index_prev_dim, tups_prev_dim, facets)
+        for i in facets:
+            indices[ends[i]] = j
+            ends[i] += 1
+
+    return indptr, indices
+
+
+@nb.njit(cache=True)
+def _minimize_coho_reps_single_dim(coho_reps_dim, deaths_dim, idxs_dim,
+                                   tups_dim, idxs_prev_dim, tups_prev_dim,
+                                   index_prev_dim, reduced_prev_dim,
+                                   reduced_dim, triangular_dim):
+    """Shorten cohomology representatives in a single dimension, see
+    `minimize_coho_reps`. In dimension 0, `idxs_prev_dim` must be empty, and
+    `tups_prev_dim`, `index_prev_dim` and `reduced_prev_dim` are then never
+    read."""
+    indptr, indices = coho_reps_dim
+    indptr_prev_dim, indices_prev_dim = reduced_prev_dim
+    indptr_dim = reduced_dim[0]
+    indptr_triangular, indices_triangular = triangular_dim
+    n_reps = len(indptr) - 1
+
+    pivots_lookup_prev_dim = np.full(len(idxs_dim), -1, dtype=np.int64)
+    for c in range(len(idxs_prev_dim)):
+        if indptr_prev_dim[c + 1] > indptr_prev_dim[c]:
+            pivots_lookup_prev_dim[indices_prev_dim[indptr_prev_dim[c]]] = c
+    # Columns added to the representatives share the dtype of those of R
+    # and V
+    if len(idxs_prev_dim):
+        indptr_cob, indices_cob = _coboundary_columns(
+            tups_dim, index_prev_dim, tups_prev_dim, indices_triangular.dtype
+            )
     else:
-        pairs_0 = []
-        coho_reps_0 = []
-        for i in range(len(idxs[0])):
-            if not reduced[0][i]:
-                pairs_0.append([-1, idxs[0][i]])
-                coho_reps_0.append(triangular[0][i])
-        pairs_0 = np.asarray(pairs_0)
-        lexsrt = _lexsort_barcode(pairs_0)
-        barcode.append(pairs_0[lexsrt])
-        coho_reps.append(nb.typed.List([coho_reps_0[k] for k in lexsrt]))
-
-        for dim in range(1, len(idxs)):
-            all_birth_indices = set()
-            pairs_dim = []
-            coho_reps_dim = []
-            for i in range(len(idxs[dim - 1])):
-                if reduced[dim - 1][i]:
-                    b = idxs[dim][reduced[dim - 1][i][0]]
-                    d = idxs[dim - 1][i]
-                    if filtration_values[b] != filtration_values[d]:
-                        pairs_dim.append([d, b])
-                        coho_reps_dim.append(reduced[dim - 1][i])
-                    all_birth_indices.add(b)
-
-            for i in range(len(idxs[dim])):
-                if idxs[dim][i] not in all_birth_indices:
-                    if not reduced[dim][i]:
-                        pairs_dim.append([-1, idxs[dim][i]])
-                        coho_reps_dim.append(triangular[dim][i])
-
-            if not len(pairs_dim):
-                pairs_dim = np.empty((0, 2), dtype=np.int64)
-            else:
-                pairs_dim = np.asarray(pairs_dim)
-            lexsrt = _lexsort_barcode(pairs_dim)
-            barcode.append(pairs_dim[lexsrt])
-            coho_reps.append(nb.typed.List([coho_reps_dim[k] for k in lexsrt]))
+        indptr_cob = np.zeros(1, dtype=np.int64)
+        indices_cob = np.empty(0, dtype=indices_triangular.dtype)
+    facets = np.empty(tups_dim.shape[1], dtype=np.int64)
+
+    coho_reps_dim_new = nb.typed.List([np.empty(0, dtype=indices.dtype)
+                                       for _ in range(n_reps)])
+    for j in range(n_reps):
+        rep = indices[indptr[j]:indptr[j + 1]].copy()
+        if not len(rep):
+            coho_reps_dim_new[j] = rep
+            continue
+        birth = idxs_dim[rep[0]]
+        # Coboundaries may also change entries before the current one, hence
+        # the repeated passes
+        n_passes_left = 1
+        while n_passes_left:
+            n_passes_left -= 1
+            pos = 1
+            while pos < len(rep):
+                rel_idx = rep[pos]
+                shortened = False
+                # Representative of a bar born earlier and dying no later
+                c = pivots_lookup_prev_dim[rel_idx]
+                if c != -1 and (deaths_dim[j] == -1 or
+                                idxs_prev_dim[c] >= deaths_dim[j]):
+                    column = indices_prev_dim[indptr_prev_dim[c]:
+                                              indptr_prev_dim[c + 1]]
+                    shortened = 2 * _n_common(rep, column) > len(column)
+                elif c == -1 and deaths_dim[j] == -1 and \
+                        indptr_dim[rel_idx + 1] == indptr_dim[rel_idx]:
+                    column = indices_triangular[indptr_triangular[rel_idx]:
+                                                indptr_triangular[rel_idx + 1]]
+                    shortened = 2 * _n_common(rep, column) > len(column)
+                # Coboundary of a facet entering the relative complex before
+                # the birth (in reverse filtration order)
+                if not shortened and len(idxs_prev_dim):
+                    _facets(tups_dim[rel_idx], index_prev_dim, tups_prev_dim,
+                            facets)
+                    for i in facets:
+                        if idxs_prev_dim[i] > birth:
+                            column = indices_cob[indptr_cob[i]:
+                                                 indptr_cob[i + 1]]
+                            if 2 * _n_common(rep, column) > len(column):
+                                shortened = True
+                                n_passes_left = 1
+                                break
+                if shortened:
+                    # rep[pos] is removed in either case
+                    out = np.empty(len(rep) + len(column), dtype=rep.dtype)
+                    rep = out[:_symm_diff_arrays(rep, 0, len(rep), column, 0,
+                                                 len(column), out)]
+                else:
+                    pos += 1
+        coho_reps_dim_new[j] = rep
 
-    return barcode, coho_reps
+    return _lists_to_columns(coho_reps_dim_new)
+
+
+def minimize_coho_reps(barcode, coho_reps, filtration_by_dim, simplex_index,
+                       reduced, triangular, stats=None):
+    """Shorten persistent relative cohomology representatives without
+    changing the barcode they represent, to speed up `get_steenrod_matrix`.
+
+    The representative of a bar ``[d, b]`` may be replaced by its sum with
+    that of any bar ``[d', b']`` with ``b' > b`` and ``d' >= d``, i.e. born
+    earlier in the reverse filtration order and dying no later (coboundaries
+    from ``b`` on being the case ``d' >= b``). The pivots of such
+    representatives are distinct and not smaller than ``b``, so each entry of
+    a representative other than its pivot is the pivot of at most one of them.
+    Entries are visited in increasing order, and the corresponding
+    representative is added whenever this strictly shortens the current one.
+    This is a greedy heuristic, so the result is not minimal in general.
+
+    Parameters
+    ----------
+    barcode : list of ndarray
+        For each dimension ``d``, a 2D int array of shape ``(n_bars, 2)`` of
+        bars in degree ``d`` with deaths in entry 0 and births in entry 1, as
+        returned by `get_barcode_and_coho_reps`. Essential bars must have
+        death equal to ``-1``.
+
+    coho_reps : list of tuple of ndarray
+        For each dimension ``d``, a sparse matrix whose column ``j`` is a
+        representative of ``barcode[d][j]``. In the same format as returned by
+        `get_barcode_and_coho_reps`.
+
+    filtration_by_dim : list of list of ndarray
+        For each dimension ``d``, a list of 2 aligned int arrays: the first is
+        a 1D array containing the (ordered) positional indices of all
+        ``d``-dimensional simplices in `filtration`; the second is a 2D array
+        whose ``i``-th row is the (sorted) collection of vertices defining the
+        ``i``-th ``d``-dimensional simplex.
+
+    simplex_index : tuple of tuple of ndarray
+        One index per simplex dimension, for looking up the positional indices
+        of ``d``-simplices relative to the ``d``-dimensional portion of the
+        filtration. In the same format as returned by `get_reduced_triangular`.
+
+    reduced : tuple of tuple of ndarray
+        One sparse matrix per simplex dimension, representing the
+        ``d``-dimensional part of the "R" matrix in R = DV. In the same format
+        as returned by `get_reduced_triangular`.
+
+    triangular : tuple of tuple of ndarray
+        One sparse matrix per simplex dimension, representing the
+        ``d``-dimensional part of the "V" matrix in R = DV. In the same format
+        as returned by `get_reduced_triangular`.
+
+    stats : dict or None, optional, default: None
+        If a dict, it is populated with the lists ``"nnz_before"`` and
+        ``"nnz_after"`` of the total lengths of the representatives in each
+        degree before and after shortening them.
+
+    Returns
+    -------
+    coho_reps : list of tuple of ndarray
+        The shortened representatives, in the same format as `coho_reps`.
+
+    """
+    coho_reps_new = []
+    for dim, coho_reps_dim in enumerate(coho_reps):
+        if len(coho_reps_dim[0]) == 1:
+            coho_reps_new.append(coho_reps_dim)
+            continue
+        idxs_dim, tups_dim = filtration_by_dim[dim]
+        prev_dim = max(dim - 1, 0)
+        idxs_prev_dim, tups_prev_dim = filtration_by_dim[prev_dim]
+        if not dim:
+            idxs_prev_dim = idxs_prev_dim[:0]
+        coho_reps_new.append(_minimize_coho_reps_single_dim(
+            coho_reps_dim, barcode[dim][:, 0], idxs_dim, tups_dim,
+            idxs_prev_dim, tups_prev_dim, simplex_index[prev_dim],
+            reduced[prev_dim], reduced[dim], triangular[dim]
+            ))
+
+    if stats is not None:
+        stats["nnz_before"] = [len(coho_reps_dim[1])
+                               for coho_reps_dim in coho_reps]
+        stats["nnz_after"] = [len(coho_reps_dim[1])
+                              for coho_reps_dim in coho_reps_new]
+
+    return coho_reps_new
 
 
-@nb.njit
 def _initialize_steenrod_matrix(num_dimensions):
-    return [nb.typed.List.empty_list(list_of_int64_typ)
+    return [(np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64))
             for _ in range(num_dimensions)]
 
 
-@lru_cache
-def _populate_steenrod_matrix_single_dim(dim_plus_k):
-    length = dim_plus_k + 1
-
-    @nb.njit(parallel=True)
-    def _inner(coho_reps_dim, tups_dim, spx2idx_dim_plus_k, n_jobs=-1):
-        steenrod_matrix_dim_plus_k = \
-            nb.typed.List([[nb.int64(0) for _ in range(0)]
-                           for _ in coho_reps_dim])
-        
-        if n_jobs == -1:
-            n_jobs = N_PHYSICAL_CORES
-
-        for job_idx in nb.prange(n_jobs):
-            for coho_reps_dim_idx in range(job_idx, len(coho_reps_dim), n_jobs):
-                rep = coho_reps_dim[coho_reps_dim_idx]
-                cocycle = tups_dim[np.asarray(rep)]
-
-                # STSQ
-                cochain = set(
-                    [to_fixed_tuple(np.empty(length, dtype=np.int64), length)
-                     for _ in range(0)]
-                    )
-                for i in range(len(cocycle)):
-                    for j in range(i + 1, len(cocycle)):
-                        a, b = set(cocycle[i]), set(cocycle[j])
-                        u = a.union(b)
-                        if len(u) == length:
-                            u_tuple = to_fixed_tuple(np.asarray(sorted(u)),
-                                                     length)
-                            if u_tuple in spx2idx_dim_plus_k:
-                                a_bar, b_bar = a.difference(b), b.difference(a)
-                                u_bar = sorted(a_bar.union(b_bar))
-                                index = {}
-                                for v in a_bar.union(b_bar):
-                                    pos = u_tuple.index(v)
-                                    pos_bar = u_bar.index(v)
-                                    index[v] = (pos + pos_bar) % 2
-                                index_a = set()
-                                index_b = set()
-                                for v in a_bar:
-                                    index_a.add(index[v])
-                                for w in b_bar:
-                                    index_b.add(index[w])
-                                if (index_a == set([0])
-                                    and index_b == set([1])) \
-                                        or (index_a == set([1])
-                                            and index_b == set([0])):
-                                    cochain ^= {u_tuple}
-
-                steenrod_matrix_dim_plus_k[coho_reps_dim_idx] = \
-                    sorted([spx2idx_dim_plus_k[spx] for spx in cochain])
-
-        return steenrod_matrix_dim_plus_k
-
-    return _inner
-
-
-def get_steenrod_matrix(k, coho_reps, filtration_by_dim, spx2idx, n_jobs=-1):
+@nb.njit(cache=True)
+def _lists_to_columns(lists):
+    """Copy a list of int sequences into a sparse matrix in ``(indptr,
+    indices)`` format."""
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    for i in range(len(lists)):
+        indptr[i + 1] = indptr[i] + len(lists[i])
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    for i in range(len(lists)):
+        for j in range(len(lists[i])):
+            indices[indptr[i] + j] = lists[i][j]
+
+    return indptr, indices
+
+
+@nb.njit(cache=True)
+def _stsq_pair(a, b, length, u):
+    """Merge the (sorted) simplices `a` and `b` into their union `u`, and
+    return its length if it equals `length` and the pair contributes to the
+    STSQ cochain, or 0 otherwise.
+
+    A pair contributes when, writing ``u_bar`` for the symmetric difference of
+    `a` and `b`, the parity of (position of v in u) + (position of v in
+    u_bar) is constant over the vertices v of `a` not in `b`, and takes the
+    opposite constant value over the vertices of `b` not in `a`. The parities
+    seen on either side are accumulated as bits of a mask: 1 for even, 2 for
+    odd."""
+    ia = ib = len_u = len_u_bar = 0
+    parities_a = parities_b = 0
+    while ia < len(a) or ib < len(b):
+        if len_u == length:
+            return 0
+        if ib == len(b) or (ia < len(a) and a[ia] < b[ib]):
+            u[len_u] = a[ia]
+            parities_a |= 1 << ((len_u + len_u_bar) & 1)
+            len_u_bar += 1
+            ia += 1
+        elif ia == len(a) or b[ib] < a[ia]:
+            u[len_u] = b[ib]
+            parities_b |= 1 << ((len_u + len_u_bar) & 1)
+            len_u_bar += 1
+            ib += 1
+        else:
+            u[len_u] = a[ia]
+            ia += 1
+            ib += 1
+        len_u += 1
+    if len_u == length and ((parities_a == 1 and parities_b == 2)
+                            or (parities_a == 2 and parities_b == 1)):
+        return len_u
+    return 0
+
+
+@nb.njit(cache=True)
+def _stsq(cocycle, faces, length, tups_dim_plus_k, index_dim_plus_k, u):
+    """Relative indices of the ``(d+k)``-simplices in the Steenrod square of
+    the cocycle whose ``d``-simplices are the rows of `cocycle`.
+
+    Only pairs of cocycle simplices whose union has `length` vertices
+    contribute, i.e. pairs sharing exactly ``d + 1 - k`` vertices. Such pairs
+    are enumerated by bucketing the cocycle simplices on their faces with
+    ``d + 1 - k`` vertices, whose positions are the rows of `faces`: a valid
+    pair lands in exactly one common bucket, that of its intersection. Faces
+    are bucketed by sorting their hashes, and matches are verified vertex by
+    vertex.
+
+    Also return the number of candidate pairs checked."""
+    n = len(cocycle)
+    n_faces, len_face = faces.shape
+    hashes = np.zeros(n * n_faces, dtype=np.int64)
+    if len_face:
+        for i in range(n):
+            for f in range(n_faces):
+                h = 1469598103934665603
+                for r in faces[f]:
+                    h = (h ^ cocycle[i, r]) * 1099511628211
+                hashes[i * n_faces + f] = h
+        order = np.argsort(hashes)
+    else:
+        # A single bucket holding every simplex
+        order = np.arange(n)
+
+    cochain = np.empty(16, dtype=np.int64)
+    n_cochain = 0
+    n_checks = 0
+    start = 0
+    while start < len(order):
+        end = start + 1
+        while end < len(order) and hashes[order[end]] == hashes[order[start]]:
+            end += 1
+        n_checks += (end - start) * (end - start - 1) // 2
+        for p in range(start, end):
+            i, f = divmod(order[p], n_faces)
+            for q in range(p + 1, end):
+                j, g = divmod(order[q], n_faces)
+                shared = True
+                for r in range(len_face):
+                    if cocycle[i, faces[f, r]] != cocycle[j, faces[g, r]]:
+                        shared = False
+                        break
+                if not shared:
+                    continue
+                len_u = _stsq_pair(cocycle[i], cocycle[j], length, u)
+                if not len_u:
+                    continue
+                idx = _find_simplex(u[:len_u], index_dim_plus_k,
+                                    tups_dim_plus_k)
+                if idx == -1:
+                    continue
+                if n_cochain == len(cochain):
+                    cochain = np.concatenate((cochain, np.empty_like(cochain)))
+                cochain[n_cochain] = idx
+                n_cochain += 1
+        start = end
+
+    # Simplices hit an even number of times cancel out
+    cochain = np.sort(cochain[:n_cochain])
+    n_kept = 0
+    start = 0
+    while start < n_cochain:
+        end = start + 1
+        while end < n_cochain and cochain[end] == cochain[start]:
+            end += 1
+        if (end - start) % 2:
+            cochain[n_kept] = cochain[start]
+            n_kept += 1
+        start = end
+
+    return cochain[:n_kept], n_checks
+
+
+@nb.njit(cache=True)
+def _schedule_by_cost(costs, n_jobs):
+    """Assign tasks with estimated `costs` to `n_jobs` jobs, longest first:
+    tasks are taken in decreasing order of cost, each going to the job with
+    the least total cost so far. Return the tasks of each job in ``(indptr,
+    indices)`` format."""
+    order = np.argsort(costs)[::-1]
+    loads = np.zeros(n_jobs, dtype=costs.dtype)
+    jobs = np.empty(len(costs), dtype=np.int64)
+    indptr = np.zeros(n_jobs + 1, dtype=np.int64)
+    for i in order:
+        job = np.argmin(loads)
+        jobs[i] = job
+        loads[job] += costs[i]
+        indptr[job + 1] += 1
+    indptr = np.cumsum(indptr)
+    indices = np.empty(len(costs), dtype=np.int64)
+    ends = indptr[:-1].copy()
+    for i in order:
+        indices[ends[jobs[i]]] = i
+        ends[jobs[i]] += 1
+
+    return indptr, indices
+
+
+@nb.njit(cache=True)
+def _perf_counter():
+    # NB: Object mode blocks cannot be cached inside parallel loops, hence
+    # this separate function
+    with nb.objmode(t="float64"):
+        t = time.perf_counter()
+    return t
+
+
+@nb.njit(parallel=True, cache=True)
+def _populate_steenrod_matrix_single_dim(coho_reps_dim, tups_dim,
+                                         tups_dim_plus_k, index_dim_plus_k,
+                                         faces, n_jobs):
+    coho_reps_indptr, coho_reps_indices = coho_reps_dim
+    n_reps = len(coho_reps_indptr) - 1
+    length = tups_dim_plus_k.shape[1]
+    steenrod_matrix_dim_plus_k = \
+        nb.typed.List([np.empty(0, dtype=np.int64) for _ in range(n_reps)])
+
+    # The cost of STSQ grows quadratically with the cocycle length in the
+    # worst case: balance the total cost across jobs accordingly
+    rep_lens = np.diff(coho_reps_indptr)
+    schedule_indptr, schedule_indices = \
+        _schedule_by_cost(rep_lens * rep_lens, n_jobs)
+    busy_times = np.zeros(n_jobs)
+    pair_checks = np.zeros(n_reps, dtype=np.int64)
+
+    for job_idx in nb.prange(n_jobs):
+        tic = _perf_counter()
+        u = np.empty(length, dtype=np.int64)
+        for pos in range(schedule_indptr[job_idx],
+                         schedule_indptr[job_idx + 1]):
+            coho_reps_dim_idx = schedule_indices[pos]
+            rep = coho_reps_indices[
+                coho_reps_indptr[coho_reps_dim_idx]:
+                coho_reps_indptr[coho_reps_dim_idx + 1]
+                ]
+            (steenrod_matrix_dim_plus_k[coho_reps_dim_idx],
+             pair_checks[coho_reps_dim_idx]) = _stsq(
+                tups_dim[rep], faces, length, tups_dim_plus_k,
+                index_dim_plus_k, u
+                )
+        busy_times[job_idx] = _perf_counter() - tic
+
+    return (_lists_to_columns(steenrod_matrix_dim_plus_k), busy_times,
+            pair_checks)
+
+
+def get_steenrod_matrix(k, coho_reps, filtration_by_dim, simplex_index,
+                        n_jobs=-1, verbose=False, stats=None):
     """Compute the Steenrod matrices in each dimension.
 
     Parameters
@@ -422,10 +1917,10 @@ def get_steenrod_matrix(k, coho_reps, filtration_by_dim, spx2idx, n_jobs=-1):
     k : int
         Positive integer defining the cohomology operation Sq^k to be performed.
 
-    coho_reps : list of ``numba.typed.List``
-        For each dimension ``d``, a list of representatives of persistent
-        relative cohomology classes in degree ``d``. In the same format as
-        returned by `get_barcode_and_coho_reps`.
+    coho_reps : list of tuple of ndarray
+        For each dimension ``d``, a sparse matrix whose columns are
+        representatives of persistent relative cohomology classes in degree
+        ``d``. In the same format as returned by `get_barcode_and_coho_reps`.
 
     filtration_by_dim : list of list of ndarray
         For each dimension ``d``, a list of 2 aligned int arrays: the first is
@@ -434,85 +1929,251 @@ def get_steenrod_matrix(k, coho_reps, filtration_by_dim, spx2idx, n_jobs=-1):
         whose ``i``-th row is the (sorted) collection of vertices defining the
         ``i``-th ``d``-dimensional simplex.
 
-    spx2idx : tuple of ``numba.typed.Dict``
-        One dictionary per simplex dimension. The dimension-``d`` dictionary has
-        the filtration ``d``-simplices (tuples of ints) as keys; the
-        corresponding values are the positional indices of those simplices
-        relative to the ``d``-dimensional portion of the filtration.
+    simplex_index : tuple of tuple of ndarray
+        One index per simplex dimension, for looking up the positional indices
+        of ``d``-simplices relative to the ``d``-dimensional portion of the
+        filtration. In the same format as returned by `get_reduced_triangular`.
 
     n_jobs : int, optional, default: ``-1``
         [Experimental] Controls the number of threads to be used during parallel
         computation of the Steenrod squares. ``-1`` means using all available
-        physical cores.
+        physical cores. Cocycle representatives are assigned to threads so as
+        to balance their estimated costs, taken to be quadratic in the
+        cocycle lengths.
+
+    verbose : bool, optional, default: ``False``
+        Whether to print, for each dimension, the time each thread spent
+        computing Steenrod squares.
+
+    stats : dict or None, optional, default: None
+        If a dict, it is populated with the following lists, holding one
+        entry per degree ``d`` of the cocycle representatives squared:
+
+        - ``"cocycle_lengths"``: 1D int array of the lengths of the columns
+          of ``coho_reps[d]``;
+        - ``"pair_checks"``: number of pairs of simplices checked by the
+          STSQ kernel, summed over the representatives in degree ``d``;
+        - ``"busy_times"``: 1D float array of the time each thread spent
+          computing Steenrod squares, in seconds.
 
     Returns
     -------
-    steenrod_matrix : list of ``numba.typed.List``
-        One list per simplex dimension. ``steenrod_matrix[d][j]`` is the result
-        of computing the Steenrod square of ``coho_reps[d][j]``.
+    steenrod_matrix : list of tuple of ndarray
+        One sparse matrix per simplex dimension, in ``(indptr, indices)``
+        format. Column ``j`` of ``steenrod_matrix[d]`` is the result of
+        computing the Steenrod square of column ``j`` of ``coho_reps[d - k]``.
 
     """
+    # NB: Resolved here rather than in the (cached) jitted kernel, where the
+    # number of cores would be frozen at compilation time
+    if n_jobs == -1:
+        n_jobs = N_PHYSICAL_CORES
     steenrod_matrix = _initialize_steenrod_matrix(k)
+    pair_checks = []
+    busy_times_by_dim = []
 
     for dim, coho_reps_dim in enumerate(coho_reps[:-k]):
-        dim_plus_k = dim + k
+        n_reps = len(coho_reps_dim[0]) - 1
+        if k > dim + 1 or not n_reps:
+            # Nothing to square, or no two d-simplices have a union with
+            # d + k + 1 vertices
+            steenrod_matrix.append((np.zeros(n_reps + 1, dtype=np.int64),
+                                    np.empty(0, dtype=np.int64)))
+            pair_checks.append(0)
+            busy_times_by_dim.append(np.zeros(0))
+            continue
         tups_dim = filtration_by_dim[dim][1]
-        spx2idx_dim_plus_k = spx2idx[dim + k]
-        populate_steenrod_matrix_single_dim = \
-            _populate_steenrod_matrix_single_dim(dim_plus_k)
-        steenrod_matrix_dim_plus_k = populate_steenrod_matrix_single_dim(
-            coho_reps_dim, tups_dim, spx2idx_dim_plus_k, n_jobs=n_jobs
-            )
+        tups_dim_plus_k = filtration_by_dim[dim + k][1]
+        faces = np.array(list(combinations(range(dim + 1), dim + 1 - k)),
+                         dtype=np.int64).reshape(comb(dim + 1, k), dim + 1 - k)
+        steenrod_matrix_dim_plus_k, busy_times, pair_checks_dim = \
+            _populate_steenrod_matrix_single_dim(
+                coho_reps_dim, tups_dim, tups_dim_plus_k,
+                simplex_index[dim + k], faces, n_jobs
+                )
+        if verbose:
+            print(f"Sq^{k} on degree {dim}, busy time per thread: "
+                  f"{np.round(busy_times, 4).tolist()}")
         steenrod_matrix.append(steenrod_matrix_dim_plus_k)
-        
+        pair_checks.append(int(pair_checks_dim.sum()))
+        busy_times_by_dim.append(busy_times)
+
+    if stats is not None:
+        stats["cocycle_lengths"] = [np.diff(coho_reps_dim[0])
+                                    for coho_reps_dim in coho_reps[:-k]]
+        stats["pair_checks"] = pair_checks
+        stats["busy_times"] = busy_times_by_dim
+
     return steenrod_matrix
 
 
-@nb.njit
+@nb.njit(cache=True)
+def _augmented_column(c, n, reduced_prev_dim, steenrod_matrix_dim, data, starts,
+                      lens, modified):
+    """Column `c` of the augmented matrix made of the ``n`` columns of R in the
+    previous dimension followed by the Steenrod columns. Columns of R and
+    unmodified Steenrod columns are read in place, modified Steenrod columns
+    from an arena."""
+    if c < n:
+        indptr, indices = reduced_prev_dim
+        return indices[indptr[c]:indptr[c + 1]]
+    c -= n
+    if modified[c]:
+        return data[starts[c]:starts[c] + lens[c]]
+    indptr, indices = steenrod_matrix_dim
+    return indices[indptr[c]:indptr[c + 1]]
+
+
+@nb.njit(cache=True)
+def _settle_steenrod_column(c, n, reduced_prev_dim, steenrod_matrix_dim, data,
+                            starts, lens, used, live, modified, pivots_lookup,
+                            dead, bits):
+    """Reduce column `c` of the augmented matrix until its pivot is free, by
+    adding to it the columns to its left which own its pivot. When a column to
+    its right owns the pivot instead, `c` takes the pivot over and that column
+    is reduced in turn. Columns reduced to zero are appended to `dead`.
+
+    The column being reduced is held in the working column `bits` from its
+    first addition on, and stored in the arena once its pivot is settled."""
+    loaded = False
+    first_word = last_word = 0
+    while True:
+        if loaded:
+            highest_one, first_word = _bitset_lowest(bits, first_word,
+                                                     last_word)
+        else:
+            column = _augmented_column(c, n, reduced_prev_dim,
+                                       steenrod_matrix_dim, data, starts, lens,
+                                       modified)
+            highest_one = column[0] if len(column) else -1
+        pivot_col = pivots_lookup[highest_one] if highest_one != -1 else -1
+        if pivot_col != -1 and pivot_col < c:
+            if not loaded:
+                _bitset_add(bits, column)
+                first_word = column[0] >> 6
+                last_word = column[-1] >> 6
+                loaded = True
+            pivot_column = _augmented_column(pivot_col, n, reduced_prev_dim,
+                                             steenrod_matrix_dim, data, starts,
+                                             lens, modified)
+            _bitset_add(bits, pivot_column)
+            last_word = max(last_word, pivot_column[-1] >> 6)
+            continue
+
+        if loaded:
+            data, used, live = _arena_store_bitset(
+                data, starts, lens, used, live, c - n, bits, first_word,
+                last_word
+                )
+            modified[c - n] = True
+            loaded = False
+        if highest_one == -1:
+            dead.append(c)
+            break
+        pivots_lookup[highest_one] = c
+        if pivot_col == -1:
+            break
+        # `c` takes the pivot over, and is added to the column owning it
+        column = _augmented_column(pivot_col, n, reduced_prev_dim,
+                                   steenrod_matrix_dim, data, starts, lens,
+                                   modified)
+        _bitset_add(bits, column)
+        first_word = column[0] >> 6
+        last_word = column[-1] >> 6
+        column = _augmented_column(c, n, reduced_prev_dim, steenrod_matrix_dim,
+                                   data, starts, lens, modified)
+        _bitset_add(bits, column)
+        last_word = max(last_word, column[-1] >> 6)
+        loaded = True
+        c = pivot_col
+
+    return data, used, live
+
+
+@nb.njit(cache=True)
 def _steenrod_barcode_single_dim(steenrod_matrix_dim, n_idxs_dim, idxs_prev_dim,
                                  reduced_prev_dim, births_dim):
-    # Construct augmented matrix
-    augmented = []
-    for i in range(len(reduced_prev_dim)):
-        augmented.append([nb.int64(x) for x in reduced_prev_dim[i]])
-    for i in range(len(steenrod_matrix_dim)):
-        augmented.append([nb.int64(x) for x in steenrod_matrix_dim[i]])
-
-    pivots_lookup = np.full(n_idxs_dim, -1, dtype=np.int64)
-    alive = np.ones(len(births_dim), dtype=np.bool_)
+    """Steenrod bars in a single dimension, by reducing the Steenrod columns
+    against the columns of R in the previous dimension added one at a time,
+    in reverse filtration order.
+
+    Steenrod columns are kept reduced from one step to the next: between two
+    steps, only the pivot of the newly added column of R can collide with that
+    of a Steenrod column, so only that column and those it collides with in
+    turn need further reduction. A Steenrod column enters once the filtration
+    reaches the birth of its bar, and dies when it is reduced to zero.
+
+    Columns of R are only read, in place. So are Steenrod columns until they
+    are first modified, after which they live in an arena."""
     n = len(idxs_prev_dim)
+    n_st = len(births_dim)
+    dtype = reduced_prev_dim[1].dtype
+    data = np.empty(64, dtype=dtype)
+    starts = np.zeros(n_st, dtype=np.int64)
+    lens = np.zeros(n_st, dtype=np.int64)
+    used = live = 0
+    modified = np.zeros(n_st, dtype=np.bool_)
+
+    # Pivots are owned by columns of the augmented matrix, whose number may
+    # exceed the range of `dtype`
+    pivots_lookup = np.full(n_idxs_dim, -1, dtype=np.int64)
+    bits = np.zeros((n_idxs_dim + 63) // 64, dtype=np.uint64)
+    alive = np.ones(n_st, dtype=np.bool_)
     st_barcode_dim = []
+    dead = [nb.int64(x) for x in range(0)]
 
     j = 0
     for i, idx in enumerate(idxs_prev_dim[::-1]):
-        if augmented[n - 1 - i]:
-            pivots_lookup[augmented[n - 1 - i][0]] = n - 1 - i
-        if births_dim[j] == idx:
+        # Bars born strictly between this simplex and the previous one (only
+        # possible if k > 1) enter before the column of R of this simplex:
+        # those whose Steenrod columns are already zero are empty
+        while j < n_st and births_dim[j] > idx:
+            data, used, live = _settle_steenrod_column(
+                n + j, n, reduced_prev_dim, steenrod_matrix_dim, data, starts,
+                lens, used, live, modified, pivots_lookup, dead, bits
+                )
             j += 1
-
-        pivot_column_idxs_from_steenrod = []
-        for ii in range(n, n + j):
-            highest_one = augmented[ii][0] if augmented[ii] else -1
+        for ii in dead:
+            alive[ii - n] = False
+        dead.clear()
+
+        col = n - 1 - i
+        indptr_prev_dim, indices_prev_dim = reduced_prev_dim
+        if indptr_prev_dim[col + 1] > indptr_prev_dim[col]:
+            highest_one = indices_prev_dim[indptr_prev_dim[col]]
             pivot_col = pivots_lookup[highest_one]
-            while (highest_one != -1) and (pivot_col != -1):
-                augmented[ii] = _symm_diff(augmented[ii][1:],
-                                           augmented[pivot_col][1:])
-                highest_one = augmented[ii][0] if augmented[ii] else -1
-                pivot_col = pivots_lookup[highest_one]
-            if highest_one != -1:
-                pivots_lookup[highest_one] = ii
-                # Record pivot indices coming from Steenrod part of augmented
-                pivot_column_idxs_from_steenrod.append(highest_one)
-            elif alive[ii - n]:
-                alive[ii - n] = False
-                if idx < births_dim[ii - n]:
-                    st_barcode_dim.append([idx, births_dim[ii - n]])
-
-        # Reset pivots_lookup for next iteration
-        for col_idx in pivot_column_idxs_from_steenrod:
-            pivots_lookup[col_idx] = -1
-
-    for i in range(len(alive)):
+            pivots_lookup[highest_one] = col
+            if pivot_col != -1:
+                data, used, live = _settle_steenrod_column(
+                    pivot_col, n, reduced_prev_dim, steenrod_matrix_dim, data,
+                    starts, lens, used, live, modified, pivots_lookup, dead,
+                    bits
+                    )
+        while j < n_st and births_dim[j] == idx:
+            data, used, live = _settle_steenrod_column(
+                n + j, n, reduced_prev_dim, steenrod_matrix_dim, data, starts,
+                lens, used, live, modified, pivots_lookup, dead, bits
+                )
+            j += 1
+
+        dead.sort()
+        for ii in dead:
+            alive[ii - n] = False
+            if idx < births_dim[ii - n]:
+                st_barcode_dim.append([idx, births_dim[ii - n]])
+        dead.clear()
+
+    # Bars born before all simplices in the previous dimension
+    while j < n_st:
+        data, used, live = _settle_steenrod_column(
+            n + j, n, reduced_prev_dim, steenrod_matrix_dim, data, starts, lens,
+            used, live, modified, pivots_lookup, dead, bits
+            )
+        j += 1
+    for ii in dead:
+        alive[ii - n] = False
+
+    for i in range(n_st):
         if alive[i]:
             st_barcode_dim.append([-1, births_dim[i]])
 
@@ -528,19 +2189,19 @@ def get_steenrod_barcode(k, steenrod_matrix, idxs, reduced, barcode,
     k : int
         Positive integer defining the cohomology operation Sq^k to be performed.
 
-    steenrod_matrix : list of ``numba.typed.List``
-        One list per simplex dimension. ``steenrod_matrix[d][j]`` is the result
-        of computing the Steenrod square of the ``j``th latest (by birth)
-        persistent relative cohomology representative in degree ``d``` (and this
-        representative must represent bar ``barcode[d][j]``). See
-        `get_steenrod_matrix`.
+    steenrod_matrix : list of tuple of ndarray
+        One sparse matrix per simplex dimension. Column ``j`` of
+        ``steenrod_matrix[d]`` is the result of computing the Steenrod square of
+        the ``j``th latest (by birth) persistent relative cohomology
+        representative in degree ``d - k`` (and this representative must
+        represent bar ``barcode[d - k][j]``). See `get_steenrod_matrix`.
 
     idxs : tuple of ndarray
         For each dimension ``d``, a 1D int array containing the (ordered)
         positional indices of all ``d``-dimensional simplices in the filtration.
 
-    reduced : tuple of ``numba.typed.List``
-        One list of int per simplex dimension, representing the
+    reduced : tuple of tuple of ndarray
+        One sparse matrix per simplex dimension, representing the
         ``d``-dimensional part of the "R" matrix in R = DV. In the same format
         as returned by `get_reduced_triangular`.
 
@@ -578,10 +2239,19 @@ def get_steenrod_barcode(k, steenrod_matrix, idxs, reduced, barcode,
     st_barcode = [np.empty((0, 2), dtype=np.int64) for _ in range(k)]
     for dim in range(k, len(steenrod_matrix)):
         births_dim = barcode[dim - k][:, 1]
+        if not len(births_dim):
+            st_barcode.append(np.empty((0, 2), dtype=np.int64))
+            continue
         idxs_dim = idxs[dim]
         idxs_prev_dim = idxs[dim - 1]
         reduced_prev_dim = reduced[dim - 1]
-        st_barcode_dim = _steenrod_barcode_single_dim(steenrod_matrix[dim],
+        # Steenrod columns are reduced alongside those of R, which may have a
+        # narrower dtype
+        indptr_st, indices_st = steenrod_matrix[dim]
+        steenrod_matrix_dim = (
+            indptr_st, indices_st.astype(reduced_prev_dim[1].dtype, copy=False)
+            )
+        st_barcode_dim = _steenrod_barcode_single_dim(steenrod_matrix_dim,
                                                       len(idxs_dim),
                                                       idxs_prev_dim,
                                                       reduced_prev_dim,
@@ -598,10 +2268,224 @@ def get_steenrod_barcode(k, steenrod_matrix, idxs, reduced, barcode,
     return st_barcode
 
 
+_CACHE_FIELDS = ("simplex_index", "idxs", "reduced", "triangular", "barcode",
+                 "coho_reps")
+_CACHE_DTYPES = {"int64": "arrays.npy", "int32": "arrays_int32.npy"}
+
+
+def _filtration_key(filtration_by_dim, filtration_values=None, n_chunks=1):
+    """Content hash of a filtration organized by dimension (including its
+    maximum dimension), of its filtration values, if any, and of the number
+    of chunks of the reduction, if greater than 1."""
+    key = hashlib.blake2b(digest_size=20)
+    key.update(f"{len(filtration_by_dim)}".encode())
+    if n_chunks > 1:
+        # The chunk algorithm may give different R and V
+        key.update(f"chunks{n_chunks}".encode())
+    arrays = [arr for arrays_dim in filtration_by_dim for arr in arrays_dim]
+    if filtration_values is not None:
+        arrays.append(filtration_values)
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        key.update(f"{arr.dtype.str}{arr.shape}".encode())
+        key.update(arr.data)
+
+    return key.hexdigest()
+
+
+def _store_reduction(cache_dir, key, reduction, cache_size):
+    """Store the output of `get_reduced_triangular` and
+    `get_barcode_and_coho_reps` as one flat int64 array and one flat int32
+    array in ``.npy`` format, together with a JSON manifest of the offsets,
+    shapes and dtypes of their constituent arrays, then evict least recently
+    used entries until the cache takes up at most `cache_size` bytes.
+
+    int32 arrays, i.e. the entries of R, V and cohomology representatives
+    when they fit, are stored as such, so that the kernels compiled for them
+    also serve cache hits."""
+    arrays = {dtype: [] for dtype in _CACHE_DTYPES}
+    manifest = {}
+    offsets = dict.fromkeys(_CACHE_DTYPES, 0)
+    for field, value in zip(_CACHE_FIELDS, reduction):
+        manifest[field] = []
+        for value_dim in value:
+            single = isinstance(value_dim, np.ndarray)
+            entries_dim = []
+            for arr in ((value_dim,) if single else value_dim):
+                dtype = "int32" if arr.dtype == np.int32 else "int64"
+                arrays[dtype].append(np.asarray(arr, dtype=dtype).ravel())
+                entries_dim.append([offsets[dtype], list(arr.shape), dtype])
+                offsets[dtype] += arr.size
+            manifest[field].append(entries_dim[0] if single else entries_dim)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp")
+    try:
+        for dtype, filename in _CACHE_DTYPES.items():
+            np.save(os.path.join(tmp_dir, filename),
+                    np.concatenate(arrays[dtype]) if arrays[dtype]
+                    else np.empty(0, dtype))
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_dir, os.path.join(cache_dir, key))
+    except OSError:
+        # Most likely, another process stored the same entry concurrently
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    _evict_cache(cache_dir, cache_size)
+
+
+def _load_cached_reduction(cache_dir, key):
+    """Memory-map a cache entry stored by `_store_reduction` back, in
+    copy-on-write mode so that the cache cannot be altered, or return ``None``
+    if there is no such entry."""
+    entry_dir = os.path.join(cache_dir, key)
+    try:
+        with open(os.path.join(entry_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+        flat = {}
+        for dtype, filename in _CACHE_DTYPES.items():
+            path = os.path.join(entry_dir, filename)
+            # Entries stored before int32 arrays were supported have no such
+            # file
+            if dtype == "int64" or os.path.exists(path):
+                flat[dtype] = np.asarray(np.load(path, mmap_mode="c"))
+        os.utime(entry_dir)
+    except (OSError, ValueError):
+        return None
+
+    def view(entry):
+        offset, shape, *dtype = entry
+        arr = flat[dtype[0] if dtype else "int64"]
+        return arr[offset:offset + int(np.prod(shape))].reshape(shape)
+
+    reduction = []
+    for field in _CACHE_FIELDS:
+        value = [view(entries_dim) if isinstance(entries_dim[0], int)
+                 else tuple(view(entry) for entry in entries_dim)
+                 for entries_dim in manifest[field]]
+        reduction.append(value if field in ("barcode", "coho_reps")
+                         else tuple(value))
+
+    return tuple(reduction)
+
+
+def _evict_cache(cache_dir, cache_size):
+    """Delete least recently used cache entries until the total size of the
+    remaining ones is at most `cache_size` bytes."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_dir() and not entry.name.startswith("."):
+            size = sum(f.stat().st_size for f in os.scandir(entry.path))
+            entries.append((entry.stat().st_mtime, size, entry.path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= cache_size:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total_size -= size
+
+
+def _persistence(barcode_dim, filtration_values=None):
+    """Persistence of each bar in a barcode in relative convention, in
+    filtration values if `filtration_values` is passed and in filtration
+    indices otherwise. Essential bars have infinite persistence."""
+    deaths, births = barcode_dim[:, 0], barcode_dim[:, 1]
+    if filtration_values is None:
+        persistence = (births - deaths).astype(np.float64)
+    else:
+        persistence = np.asarray(
+            filtration_values[births] - filtration_values[deaths],
+            dtype=np.float64
+            )
+    persistence[deaths == -1] = np.inf
+
+    return persistence
+
+
+def _restrict_to_long_bars(barcode, coho_reps, min_persistence,
+                           filtration_values=None):
+    """Restrict a barcode and its cohomology representatives, as returned by
+    `get_barcode_and_coho_reps`, to bars with persistence at least
+    `min_persistence`.
+
+    Removing the Sq^k-images of the shorter bars from the Steenrod barcode
+    computation does not affect Sq^k-bars with persistence at least
+    `min_persistence`. Indeed, the Sq^k-image of a finite bar ``[d, b]`` is a
+    coboundary from ``d`` on, so it can only be needed to reduce the
+    Sq^k-image of a bar born at ``b' <= b`` before ``d``, while
+    ``d > b - min_persistence >= b' - min_persistence``. The remaining
+    Sq^k-bars shorter than `min_persistence` may die later than they should,
+    but they stay shorter than `min_persistence`."""
+    long_barcode = []
+    long_coho_reps = []
+    for barcode_dim, coho_reps_dim in zip(barcode, coho_reps):
+        cols = np.flatnonzero(
+            _persistence(barcode_dim, filtration_values) >= min_persistence
+            )
+        long_barcode.append(barcode_dim[cols])
+        long_coho_reps.append(_gather_columns(
+            (coho_reps_dim,), np.zeros(len(cols), dtype=np.int64), cols
+            ))
+
+    return long_barcode, long_coho_reps
+
+
+def _reset_peak_rss():
+    """Reset the peak resident set size of the current process to its current
+    value, where supported (on Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss():
+    """Peak resident set size of the current process since the last call to
+    `_reset_peak_rss`, or so far if it cannot be reset, in bytes."""
+    try:
+        # Unlike ru_maxrss, reset by _reset_peak_rss
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return psutil.Process().memory_info().peak_wset
+    # Reported in kilobytes, except on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _start_stage(track_rss):
+    """Reset the peak RSS if `track_rss` is ``True``, and return the current
+    time."""
+    if track_rss:
+        _reset_peak_rss()
+
+    return time.perf_counter()
+
+
+def _record_stage(stages, name, tic, track_rss):
+    """Record the time elapsed since `tic` in ``stages[name]``, together with
+    the peak RSS if `track_rss` is ``True``, and start the next stage."""
+    toc = time.perf_counter()
+    stages[name] = {"time": toc - tic}
+    if track_rss:
+        stages[name]["peak_rss"] = _peak_rss()
+        _reset_peak_rss()
+
+    return toc
+
+
 def barcodes(
         k, filtration, absolute=False, filtration_values=None,
         return_filtration_values=False, maxdim=None, verbose=False,
-        n_jobs=1
+        n_jobs=1, offsets=None, cache_dir=None,
+        cache_size=2 ** 30, stats=None, min_persistence=None,
+        minimize_reps=False, chunked=False, degrees=None
         ):
     """Given a filtration, compute ordinary persistent (relative or absolute)
     (co)homology barcodes and relative Steenrod barcodes.
@@ -611,10 +2495,17 @@ def barcodes(
     k : int
         Positive integer defining the cohomology operation Sq^k to be performed.
 
-    filtration : sequence of list-like of int
+    filtration : sequence of list-like of int, list of list of ndarray, or \
+        str
         Represents a simplex-wise filtration. Entry ``i`` is a list/tuple/set
         containing the integer indices of the vertices defining the ``i``th
-        simplex in the filtration.
+        simplex in the filtration. Alternatively, a filtration already
+        organized by dimension as returned by `sort_filtration_by_dim` or
+        `rips_filtration`, whose arrays may be memory-mapped, or a flat 1D int
+        array of vertices if `offsets` is passed. Alternatively, the path to
+        a directory in the layout described in `save_filtration`, which is
+        memory-mapped as by `load_filtration`; its filtration values are used
+        if `filtration_values` is ``None``.
 
     absolute : bool, optional, default: ``False``
         If ``True``, return the ordinary persistent absolute homology barcode,
@@ -638,12 +2529,55 @@ def barcodes(
         simplices are included.
 
     verbose : bool, optional, default: ``False``
-        Whether to print timings for the intermediate steps in the computation.
+        Whether to print timings for the intermediate steps in the computation,
+        including the time each thread spent computing Steenrod squares.
 
     n_jobs : int, optional, default: ``1``
         [Experimental] Controls the number of threads to be used during parallel
-        computation of the Steenrod squares. ``-1`` means using all available
-        physical cores.
+        computation of the Steenrod squares, and to build coboundary matrices
+        ahead of the reduction (see `get_reduced_triangular`). ``-1`` means
+        using all available physical cores.
+
+    offsets : ndarray or None, optional, default: None
+        If not ``None``, `filtration` is given in compressed sparse row format:
+        the vertices of the ``i``th simplex are
+        ``filtration[offsets[i]:offsets[i + 1]]``. See
+        `sort_filtration_by_dim`.
+
+    cache_dir : str or None, optional, default: None
+        If not ``None``, a directory in which to cache the k-independent part
+        of the computation, i.e. the outputs of `get_reduced_triangular` and
+        `get_barcode_and_coho_reps`. Entries are keyed by a hash of the
+        filtration (as organized by dimension, hence including `maxdim`), of
+        `filtration_values` and, if `chunked` is ``True``, of the number of
+        chunks, and are memory-mapped back on later calls with the same
+        inputs, which then start directly at `get_steenrod_matrix`.
+
+    cache_size : int, optional, default: ``2 ** 30``
+        Maximum total size in bytes of the entries in `cache_dir`. Least
+        recently used entries are evicted beyond this size.
+
+    stats : dict or None, optional, default: None
+        If a dict, it is populated with statistics about the computation, as
+        described in `barcodes_multi`.
+
+    min_persistence : float or None, optional, default: None
+        If not ``None``, only Steenrod bars with persistence at least
+        `min_persistence` are computed, as described in `barcodes_multi`.
+
+    minimize_reps : bool, optional, default: ``False``
+        Whether to shorten the cohomology representatives before computing
+        Steenrod squares. See `minimize_coho_reps`.
+
+    chunked : bool, optional, default: ``False``
+        Whether to also parallelize the reduction within each dimension over
+        `n_jobs` threads, with the chunk algorithm. See
+        `get_reduced_triangular`.
+
+    degrees : iterable of int or None, optional, default: None
+        If not ``None``, the degrees ``d`` of the classes of interest: only
+        the ordinary bars in these degrees and the Sq^k-bars in degrees
+        ``d + k`` are computed, as described in `barcodes_multi`.
 
     Returns
     -------
@@ -665,48 +2599,491 @@ def barcodes(
         used for birth and death values.
 
     """
+    barcode, st_barcodes = barcodes_multi(
+        (k,), filtration, absolute=absolute,
+        filtration_values=filtration_values,
+        return_filtration_values=return_filtration_values, maxdim=maxdim,
+        verbose=verbose, n_jobs=n_jobs, offsets=offsets,
+        cache_dir=cache_dir, cache_size=cache_size, stats=stats,
+        min_persistence=min_persistence, minimize_reps=minimize_reps,
+        chunked=chunked, degrees=degrees
+        )
+
+    return barcode, st_barcodes[k]
+
+
+def barcodes_multi(
+        ks, filtration, absolute=False, filtration_values=None,
+        return_filtration_values=False, maxdim=None, verbose=False,
+        n_jobs=1, offsets=None, cache_dir=None,
+        cache_size=2 ** 30, stats=None, min_persistence=None,
+        minimize_reps=False, chunked=False, degrees=None
+        ):
+    """Given a filtration, compute ordinary persistent (relative or absolute)
+    (co)homology barcodes and relative Steenrod barcodes for several
+    cohomology operations Sq^k at once.
+
+    The filtration is sorted and reduced, and cohomology representatives are
+    extracted, only once; only the Steenrod matrices and barcodes are computed
+    separately for each ``k``. The output is the same as that of calling
+    `barcodes` once per value in `ks`.
+
+    Parameters
+    ----------
+    ks : iterable of int
+        Positive integers defining the cohomology operations Sq^k to be
+        performed.
+
+    filtration : sequence of list-like of int, list of list of ndarray, or \
+        str
+        Represents a simplex-wise filtration. Entry ``i`` is a list/tuple/set
+        containing the integer indices of the vertices defining the ``i``th
+        simplex in the filtration. Alternatively, a filtration already
+        organized by dimension as returned by `sort_filtration_by_dim` or
+        `rips_filtration`, whose arrays may be memory-mapped, or a flat 1D int
+        array of vertices if `offsets` is passed. Alternatively, the path to
+        a directory in the layout described in `save_filtration`, which is
+        memory-mapped as by `load_filtration`; its filtration values are used
+        if `filtration_values` is ``None``.
+
+    absolute : bool, optional, default: ``False``
+        If ``True``, return the ordinary persistent absolute homology barcode,
+        and move inessential relative Steenrod bars to one degree lower while
+        keeping essential bars in their degree. If ``False``, return the
+        ordinary persistent relative cohomology barcode and relative Steenrod
+        barcode.
+
+    filtration_values : ndarray or None, optional, default: None
+        Optionally, a single 1D array of filtration values for each simplex in
+        the filtration. Ordinary and Steenrod bars with equal birth and death
+        filtration values are discarded by the computation.
+
+    return_filtration_values : bool, optional, default: ``False``
+        If ``True``, birth and deaths will be expressed as filtration values
+        instead of filtration indices. Ignored if `filtration_values` is
+        ``None``.
+
+    maxdim : int or None, optional, default: None
+        Maximum simplex dimension to be included. ``None`` means that all
+        simplices are included.
+
+    verbose : bool, optional, default: ``False``
+        Whether to print timings for the intermediate steps in the computation,
+        including the time each thread spent computing Steenrod squares.
+
+    n_jobs : int, optional, default: ``1``
+        [Experimental] Controls the number of threads to be used during parallel
+        computation of the Steenrod squares, and to build coboundary matrices
+        ahead of the reduction (see `get_reduced_triangular`). ``-1`` means
+        using all available physical cores.
+
+    offsets : ndarray or None, optional, default: None
+        If not ``None``, `filtration` is given in compressed sparse row format:
+        the vertices of the ``i``th simplex are
+        ``filtration[offsets[i]:offsets[i + 1]]``. See
+        `sort_filtration_by_dim`.
+
+    cache_dir : str or None, optional, default: None
+        If not ``None``, a directory in which to cache the k-independent part
+        of the computation, i.e. the outputs of `get_reduced_triangular` and
+        `get_barcode_and_coho_reps`. Entries are keyed by a hash of the
+        filtration (as organized by dimension, hence including `maxdim`), of
+        `filtration_values` and, if `chunked` is ``True``, of the number of
+        chunks, and are memory-mapped back on later calls with the same
+        inputs, which then start directly at `get_steenrod_matrix`.
+
+    cache_size : int, optional, default: ``2 ** 30``
+        Maximum total size in bytes of the entries in `cache_dir`. Least
+        recently used entries are evicted beyond this size.
+
+    stats : dict or None, optional, default: None
+        If a dict, it is populated with statistics about the computation,
+        under the following keys:
+
+        - ``"stages"``: for each stage of the computation up to and including
+          `get_barcode_and_coho_reps` (or the loading of a cached entry, see
+          `cache_dir`), including `load_filtration` if `filtration` is a
+          path, a dict with the wall-clock ``"time"`` taken in seconds and
+          the ``"peak_rss"`` of the process during the stage, in bytes. On
+          systems other than Linux, where the peak RSS of a process cannot
+          be reset, the latter is the peak RSS of the process up to the end
+          of the stage instead;
+        - ``"reduction"``: per-dimension statistics of the reduction, as
+          collected by `get_reduced_triangular`. Empty if the reduction was
+          loaded from `cache_dir`;
+        - ``"coho_reps"``: if `minimize_reps` is ``True``, the statistics
+          collected by `minimize_coho_reps`, with a ``"stages"`` entry as
+          above for it;
+        - ``"steenrod"``: a dict mapping each ``k`` in `ks` to the
+          per-degree statistics collected by `get_steenrod_matrix`, plus a
+          ``"stages"`` entry as above for `get_steenrod_matrix` and
+          `get_steenrod_barcode`.
+
+        Collecting these statistics has negligible cost. On Linux, it resets
+        the peak RSS (``VmHWM``) of the process at the start of each stage,
+        so that the peak RSS read by other means after the call only covers
+        its last stage.
+
+    min_persistence : float or None, optional, default: None
+        If not ``None``, only Steenrod bars with persistence at least
+        `min_persistence` are computed and returned. Persistence is the
+        difference between birth and death, measured in filtration values if
+        `filtration_values` is passed and in filtration indices otherwise;
+        essential bars have infinite persistence. As the Sq^k-image of a class
+        cannot outlive the class, Steenrod squares are then only computed for
+        the representatives of ordinary bars of persistence at least
+        `min_persistence`, which on noisy data is usually a small fraction of
+        them. The Sq^k-bars of persistence at least `min_persistence` are
+        exactly those of the full Sq^k-barcode; all shorter Sq^k-bars are
+        missed, including all those of shorter ordinary bars. The ordinary
+        barcode is not affected.
+
+    minimize_reps : bool, optional, default: ``False``
+        Whether to shorten the cohomology representatives of the bars in all
+        degrees which are squared, after restricting to long bars if
+        `min_persistence` is passed, before computing Steenrod squares. See
+        `minimize_coho_reps`. The cost of the STSQ kernel is quadratic in the
+        lengths of the representatives in the worst case.
+
+    chunked : bool, optional, default: ``False``
+        Whether to also parallelize the reduction within each dimension over
+        `n_jobs` threads, with the chunk algorithm. See
+        `get_reduced_triangular`.
+
+    degrees : iterable of int or None, optional, default: None
+        If not ``None``, the degrees ``d`` of the classes of interest: the
+        ordinary barcode is only computed in these degrees, and the
+        Sq^k-barcodes only in the degrees ``d + k``, i.e. from the Steenrod
+        squares of the representatives in degree ``d``. All other entries of
+        the output barcodes are empty. Only the dimensions from ``d - 1`` to
+        ``d + k - 1`` are reduced (see `dims` in `get_reduced_triangular`), so
+        that time and memory scale with the degrees of interest rather than
+        with `maxdim`. A full reduction cached in `cache_dir` is used if
+        present, but partial ones are not stored. Not supported with
+        `absolute`, which needs the ordinary bars of the degree above.
+
+    Returns
+    -------
+    barcode : list of ndarray
+        The ordinary barcode, as returned by `barcodes`.
+
+    st_barcodes : dict of int to list of ndarray
+        For each ``k`` in `ks`, the (relative) Sq^k-barcode as returned by
+        `barcodes`.
+
+    """
+    ks = list(ks)
+    stages = {}
+    # Only measured for stats, as resetting it costs system calls
+    track_rss = stats is not None
+    tic = _start_stage(track_rss)
+    if isinstance(filtration, (str, os.PathLike)):
+        filtration, stored_filtration_values = load_filtration(filtration,
+                                                               maxdim=maxdim)
+        if filtration_values is None:
+            filtration_values = stored_filtration_values
+        tic = _record_stage(stages, "load_filtration", tic, track_rss)
+    if offsets is None and _is_filtration_by_dim(filtration):
+        filtration_by_dim = list(filtration)
+        if maxdim is not None:
+            filtration_by_dim = filtration_by_dim[:maxdim + 1]
+    else:
+        filtration_by_dim = sort_filtration_by_dim(filtration, maxdim=maxdim,
+                                                   offsets=offsets)
+    tic = _record_stage(stages, "sort_filtration_by_dim", tic, track_rss)
+    if degrees is not None:
+        if absolute:
+            raise ValueError("`degrees` is not supported with "
+                             "`absolute=True`.")
+        degrees = sorted(set(degrees))
+        top_dim = len(filtration_by_dim) - 1
+        if not degrees or degrees[0] < 0 or degrees[-1] > top_dim:
+            raise ValueError(f"`degrees` must be a nonempty collection of "
+                             f"degrees between 0 and {top_dim}.")
+        # Degree d needs R in dimensions d - 1 and d and V in dimension d,
+        # and its Sq^k-bars need R in dimension d + k - 1
+        dims = set()
+        for d in degrees:
+            dims.update((max(d - 1, 0), d))
+            dims.update(d + k - 1 for k in ks if d + k <= top_dim)
+    reduction = None
+    reduction_stats = {}
+    if cache_dir is not None:
+        n_chunks = (N_PHYSICAL_CORES if n_jobs == -1 else n_jobs) \
+            if chunked else 1
+        key = _filtration_key(filtration_by_dim,
+                              filtration_values=filtration_values,
+                              n_chunks=n_chunks)
+        reduction = _load_cached_reduction(cache_dir, key)
+    if reduction is None:
+        simplex_index, idxs, reduced, triangular = get_reduced_triangular(
+            filtration_by_dim, n_jobs=n_jobs, chunked=chunked,
+            dims=None if degrees is None else dims, stats=reduction_stats
+            )
+        tic = _record_stage(stages, "get_reduced_triangular", tic,
+                            track_rss)
+        barcode, coho_reps = get_barcode_and_coho_reps(
+            idxs, reduced,
+            triangular if degrees is None else
+            [triangular_dim if dim in degrees else None
+             for dim, triangular_dim in enumerate(triangular)],
+            filtration_values=filtration_values
+            )
+        tic = _record_stage(stages, "get_barcode_and_coho_reps", tic,
+                            track_rss)
+        if cache_dir is not None and degrees is None:
+            _store_reduction(cache_dir, key,
+                             (simplex_index, idxs, reduced, triangular,
+                              barcode, coho_reps),
+                             cache_size)
+            tic = _record_stage(stages, "store_reduction", tic, track_rss)
+    else:
+        simplex_index, idxs, reduced, triangular, barcode, coho_reps = \
+            reduction
+        tic = _record_stage(stages, "load_cached_reduction", tic, track_rss)
+        if degrees is not None:
+            barcode = [barcode_dim if dim in degrees else barcode_dim[:0]
+                       for dim, barcode_dim in enumerate(barcode)]
+            coho_reps = [
+                coho_reps_dim if dim in degrees else
+                (coho_reps_dim[0][:1], coho_reps_dim[1][:0])
+                for dim, coho_reps_dim in enumerate(coho_reps)
+                ]
     if verbose:
-        tic = time.time()
-    filtration_by_dim = sort_filtration_by_dim(filtration, maxdim=maxdim)
-    spx2idx, idxs, reduced, triangular = \
-        get_reduced_triangular(filtration_by_dim)
-    barcode, coho_reps = \
-        get_barcode_and_coho_reps(idxs, reduced, triangular,
-                                  filtration_values=filtration_values)
-    if verbose:
-        toc = time.time()
-        print(f"Usual barcode computed, time taken: {toc - tic}")
-        tic = time.time()
-    steenrod_matrix = get_steenrod_matrix(k, coho_reps, filtration_by_dim,
-                                          spx2idx, n_jobs=n_jobs)
-    if verbose:
-        toc = time.time()
-        print(f"Steenrod matrix computed, time taken: {toc - tic}")
-        tic = time.time()
-    st_barcode = get_steenrod_barcode(k, steenrod_matrix, idxs, reduced,
-                                      barcode,
-                                      filtration_values=filtration_values)
-    if verbose:
-        toc = time.time()
-        print(f"Steenrod barcode computed, time taken: {toc - tic}")
+        print(f"Usual barcode computed, time taken: "
+              f"{sum(stage['time'] for stage in stages.values())}")
+
+    if min_persistence is None:
+        long_barcode, long_coho_reps = barcode, coho_reps
+    else:
+        long_barcode, long_coho_reps = _restrict_to_long_bars(
+            barcode, coho_reps, min_persistence,
+            filtration_values=filtration_values
+            )
+    coho_reps_stats = {}
+    if minimize_reps:
+        # Representatives in the top degrees are never squared
+        n_squared = max(len(long_coho_reps) - min(ks), 0)
+        coho_reps_stats["stages"] = {}
+        tic = _start_stage(track_rss)
+        long_coho_reps = minimize_coho_reps(
+            long_barcode[:n_squared], long_coho_reps[:n_squared],
+            filtration_by_dim, simplex_index, reduced, triangular,
+            stats=coho_reps_stats
+            ) + long_coho_reps[n_squared:]
+        _record_stage(coho_reps_stats["stages"], "minimize_coho_reps", tic,
+                      track_rss)
+        if verbose:
+            print(f"Cohomology representatives minimized, time taken: "
+                  f"{coho_reps_stats['stages']['minimize_coho_reps']['time']}, "
+                  f"total lengths before: {coho_reps_stats['nnz_before']}, "
+                  f"after: {coho_reps_stats['nnz_after']}")
+
+    st_barcodes = {}
+    steenrod_stats = {}
+    for k in ks:
+        if k in st_barcodes:
+            continue
+        steenrod_stats[k] = {"stages": {}}
+        tic = _start_stage(track_rss)
+        steenrod_matrix = get_steenrod_matrix(k, long_coho_reps,
+                                              filtration_by_dim,
+                                              simplex_index, n_jobs=n_jobs,
+                                              verbose=verbose,
+                                              stats=steenrod_stats[k])
+        tic = _record_stage(steenrod_stats[k]["stages"],
+                            "get_steenrod_matrix", tic, track_rss)
+        if verbose:
+            print(f"Sq^{k} Steenrod matrix computed, time taken: "
+                  f"{steenrod_stats[k]['stages']['get_steenrod_matrix']['time']}")
+        st_barcodes[k] = get_steenrod_barcode(
+            k, steenrod_matrix, idxs, reduced, long_barcode,
+            filtration_values=filtration_values
+            )
+        if min_persistence is not None:
+            # Sq^k-bars shorter than min_persistence may be missing or have
+            # wrong deaths, but are never reported as long
+            st_barcodes[k] = [
+                st_barcode_dim[_persistence(st_barcode_dim, filtration_values)
+                               >= min_persistence]
+                for st_barcode_dim in st_barcodes[k]
+                ]
+        _record_stage(steenrod_stats[k]["stages"], "get_steenrod_barcode", tic,
+                      track_rss)
+        if verbose:
+            print(f"Sq^{k} Steenrod barcode computed, time taken: "
+                  f"{steenrod_stats[k]['stages']['get_steenrod_barcode']['time']}")
+
+    if stats is not None:
+        stats["stages"] = stages
+        stats["reduction"] = reduction_stats
+        if minimize_reps:
+            stats["coho_reps"] = coho_reps_stats
+        stats["steenrod"] = steenrod_stats
 
     if absolute:
         barcode = _to_absolute_barcode(
             barcode, filtration_values=filtration_values,
             return_filtration_values=return_filtration_values
             )
-        st_barcode = _to_absolute_barcode(
-            st_barcode, filtration_values=filtration_values,
-            return_filtration_values=return_filtration_values
-            )
-
-        return barcode, st_barcode
+        st_barcodes = {
+            k: _to_absolute_barcode(
+                st_barcode, filtration_values=filtration_values,
+                return_filtration_values=return_filtration_values
+                )
+            for k, st_barcode in st_barcodes.items()
+            }
 
     elif return_filtration_values and (filtration_values is not None):
         barcode = _to_values_barcode(barcode, filtration_values)
-        st_barcode = _to_values_barcode(st_barcode, filtration_values)
+        st_barcodes = {k: _to_values_barcode(st_barcode, filtration_values)
+                       for k, st_barcode in st_barcodes.items()}
+
+    return barcode, st_barcodes
+
+
+def barcodes_batch(k, filtrations, filtration_values=None, n_workers=None,
+                   ordered=True, max_in_flight=None, **kwargs):
+    """Compute ordinary and Sq^k-barcodes for many filtrations in parallel,
+    using a pool of worker processes.
+
+    Filtrations are consumed lazily from `filtrations`, and at most
+    `max_in_flight` of them are submitted to the pool or waiting to be
+    yielded at any given time, which bounds memory usage regardless of the
+    number of inputs. Compiled kernels are shared between the workers
+    through numba's on-disk cache: `warmup` compiles them at most once, in
+    the calling process, for all options of `barcodes` (including
+    `minimize_reps`, `min_persistence` and `cache_dir`), and each worker
+    loads them when it starts.
+
+    Parameters
+    ----------
+    k : int
+        Positive integer defining the cohomology operation Sq^k to be performed.
+
+    filtrations : iterable
+        Filtrations in any of the formats accepted by `barcodes`. Paths to
+        directories written by `save_filtration` are the cheapest to send to
+        the workers, which memory-map them.
+
+    filtration_values : iterable or None, optional, default: None
+        If not ``None``, the filtration values for each entry of
+        `filtrations`, see `barcodes`.
+
+    n_workers : int or None, optional, default: None
+        Number of worker processes. ``None`` means using as many workers as
+        physical cores.
+
+    ordered : bool, optional, default: ``True``
+        If ``True``, results are yielded in the order of `filtrations`.
+        Otherwise, they are yielded as soon as they are available. In the
+        former case, a slow filtration may leave workers idle once
+        `max_in_flight` later results are waiting to be yielded.
+
+    max_in_flight : int or None, optional, default: None
+        Maximum number of filtrations being processed or whose results are
+        waiting to be yielded. ``None`` means ``2 * n_workers``.
 
-    return barcode, st_barcode
+    **kwargs
+        Further keyword arguments passed to `barcodes`, e.g. `absolute`,
+        `maxdim` or `n_jobs` (the number of threads used by each worker).
+
+    Yields
+    ------
+    i : int
+        Position of the filtration in `filtrations`.
+
+    barcode : list of ndarray
+        The ordinary barcode, as returned by `barcodes`.
+
+    st_barcode : list of ndarray
+        The (relative) Sq^k-barcode, as returned by `barcodes`.
+
+    Notes
+    -----
+    Workers are started with the ``"spawn"`` method, so scripts calling this
+    function must guard their entry point with
+    ``if __name__ == "__main__":``.
+
+    """
+    if n_workers is None:
+        n_workers = N_PHYSICAL_CORES
+    if max_in_flight is None:
+        max_in_flight = 2 * n_workers
+    if filtration_values is None:
+        filtration_values = repeat(None)
+    inputs = enumerate(zip(filtrations, filtration_values))
+
+    # Populate the on-disk cache once, before the workers load from it
+    warmup()
+    executor = ProcessPoolExecutor(
+        max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"),
+        initializer=warmup
+        )
+    try:
+        pending = {}
+        results = {}
+        next_i = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) + len(results) < max_in_flight:
+                try:
+                    i, (filtration, values) = next(inputs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = executor.submit(barcodes, k, filtration,
+                                         filtration_values=values, **kwargs)
+                pending[future] = i
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                if ordered:
+                    results[i] = future.result()
+                else:
+                    yield (i,) + future.result()
+            while next_i in results:
+                yield (next_i,) + results.pop(next_i)
+                next_i += 1
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def warmup():
+    """Compile all jitted kernels used by `rips_filtration`, `barcodes` and
+    `barcodes_multi`, by running them on a tiny filtration.
+
+    Kernels are compiled with numba's on-disk caching, so this is only slow
+    the first time it is called for a given installation: later processes load
+    the compiled kernels from the cache instead. The kernels are generic in
+    the dimension and in ``k``, so a single warm-up covers all filtrations and
+    cohomology operations. Compiled kernels are stored in the ``__pycache__``
+    directory of the package if it is writable, and in a user-wide cache
+    directory otherwise; the ``NUMBA_CACHE_DIR`` environment variable can be
+    used to override this, e.g. to share a cache between workers.
+
+    Returns
+    -------
+    time_taken : float
+        Wall-clock time taken, in seconds.
+
+    """
+    tic = time.perf_counter()
+    X = np.array([[0., 0.], [1., 0.], [0., 2.], [1., 2.]])
+    dm = np.sqrt(np.sum((X[:, np.newaxis] - X) ** 2, axis=-1))
+    rips_filtration(dm[np.triu_indices(len(X), k=1)], maxdim=2)
+    rips_filtration(X, maxdim=2, collapse_edges=True)
+    filtration_by_dim, filtration_values = rips_filtration(X, maxdim=2)
+    barcodes(1, filtration_by_dim, filtration_values=filtration_values)
+    barcodes(1, filtration_by_dim)
+    barcodes(1, filtration_by_dim, minimize_reps=True)
+    barcodes(1, filtration_by_dim, filtration_values=filtration_values,
+             min_persistence=0.)
+
+    return time.perf_counter() - tic
 
 
 def _to_absolute_barcode(rel_barcode, filtration_values=None,
@@ -775,47 +3152,6 @@ def check_agreement_with_gudhi(gudhi_barcode, barcode):
             f"Disagreement in degree {dim}"
 
 
-@nb.njit
-def _symm_diff(x, y):
-    n = len(x)
-    m = len(y)
-    result = []
-    i = 0
-    j = 0
-    while (i < n) and (j < m):
-        if x[i] < y[j]:
-            result.append(x[i])
-            i += 1
-        elif y[j] < x[i]:
-            result.append(y[j])
-            j += 1
-        else:
-            i += 1
-            j += 1
-
-    while i < n:
-        result.append(x[i])
-        i += 1
-
-    while j < m:
-        result.append(y[j])
-        j += 1
-
-    return result
-
-
-@nb.njit
+@nb.njit(cache=True)
 def _lexsort_barcode(arr):
     return np.argsort(arr[:, 1])[::-1]
-
-
-@nb.njit
-def _drop_elements(tup: tuple):
-    for x in range(len(tup)):
-        empty = tup[:-1]  # Not empty, but the right size and will be mutated
-        idx = 0
-        for i in range(len(tup)):
-            if i != x:
-                empty = tuple_setitem(empty, idx, tup[i])
-                idx += 1
-        yield empty
@@ -0,0 +1,158 @@
+"""Filtrations shared by the tests. Each builder returns a dict with keys
+``"filtration"``, ``"offsets"`` and ``"filtration_values"``, ready to be
+passed to `steenroder.barcodes`."""
+from itertools import combinations, permutations, product
+
+import numpy as np
+import pytest
+
+import steenroder as st
+
+
+def _closure(top_simplices):
+    """All faces of the given simplices, ordered by dimension and then
+    lexicographically."""
+    simplices = set()
+    for spx in top_simplices:
+        for r in range(1, len(spx) + 1):
+            simplices.update(combinations(sorted(spx), r))
+
+    return sorted(simplices, key=lambda spx: (len(spx), spx))
+
+
+def _rp_triangulation(n):
+    """Triangulation of RP^n, as the quotient by the antipodal map of the
+    barycentric subdivision of the boundary of the ``(n + 1)``-dimensional
+    cross-polytope."""
+    vertices = {}
+
+    def vertex(face):
+        sign = next(s for s in face if s)
+        face = tuple(sign * s for s in face)
+        return vertices.setdefault(face, len(vertices))
+
+    top_simplices = set()
+    for perm in permutations(range(n + 1)):
+        for signs in product((1, -1), repeat=n):
+            face = [0] * (n + 1)
+            chain = []
+            for i, s in zip(perm, (1,) + signs):
+                face[i] = s
+                chain.append(vertex(face))
+            top_simplices.add(tuple(sorted(chain)))
+
+    return {"filtration": _closure(top_simplices), "offsets": None,
+            "filtration_values": None}
+
+
+def _cone(dataset):
+    """Cone on a triangulation, filtered by adding all of it first and then
+    the apex and the cones on its simplices, by dimension."""
+    filtration = dataset["filtration"]
+    apex = max(max(spx) for spx in filtration) + 1
+    cone_simplices = [(apex,)] + [spx + (apex,) for spx in filtration]
+
+    return {"filtration": filtration + sorted(cone_simplices, key=len),
+            "offsets": None, "filtration_values": None}
+
+
+def _flat_klein_bottle_distances(num):
+    """Condensed distance matrix of a ``num x num`` grid on the flat Klein
+    bottle."""
+    grid = np.linspace(0, 1, num=num, endpoint=False)
+    square = np.stack(np.meshgrid(grid, grid, indexing="ij"),
+                      axis=-1).reshape(-1, 2)
+    flipped = square * [1, -1] + [0, 1]
+    copies = [square + [0, dy] for dy in (0, 1, -1)] + \
+        [flipped + [dx, dy] for dx in (1, -1) for dy in (0, 1, -1)]
+    sq_dists = np.min([np.sum((square[:, np.newaxis] - copy) ** 2, axis=-1)
+                       for copy in copies], axis=0)
+
+    return np.sqrt(sq_dists)[np.triu_indices(len(square), k=1)]
+
+
+def _flat_klein_bottle(num, threshold=0.3, maxdim=3):
+    """Vietoris–Rips filtration of a ``num x num`` grid on the flat Klein
+    bottle, as a filtration organized by dimension."""
+    filtration_by_dim, filtration_values = st.rips_filtration(
+        _flat_klein_bottle_distances(num), threshold=threshold, maxdim=maxdim
+        )
+
+    return {"filtration": filtration_by_dim, "offsets": None,
+            "filtration_values": filtration_values}
+
+
+@pytest.fixture
+def rp_triangulation():
+    return _rp_triangulation
+
+
+@pytest.fixture
+def cone():
+    return _cone
+
+
+@pytest.fixture
+def flat_klein_bottle():
+    return _flat_klein_bottle
+
+
+@pytest.fixture
+def flat_klein_bottle_distances():
+    return _flat_klein_bottle_distances
+
+
+# Filtrations with nontrivial Sq^k-bars, with the value of k
+STEENROD_CASES = {
+    "klein_6": (lambda: _flat_klein_bottle(6), 1),
+    "klein_10": (lambda: _flat_klein_bottle(10), 1),
+    "cone_rp3": (lambda: _cone(_rp_triangulation(3)), 1),
+    "cone_rp4": (lambda: _cone(_rp_triangulation(4)), 2),
+    }
+
+
+@pytest.fixture(params=list(STEENROD_CASES))
+def steenrod_case(request):
+    """A filtration with nontrivial Sq^k-bars and the value of k."""
+    builder, k = STEENROD_CASES[request.param]
+    return builder(), k
+
+
+def _barcodes(dataset, k, **kwargs):
+    return st.barcodes(k, dataset["filtration"], offsets=dataset["offsets"],
+                       filtration_values=dataset["filtration_values"],
+                       **kwargs)
+
+
+def _assert_barcodes_equal(barcode, expected):
+    assert len(barcode) == len(expected)
+    for barcode_dim, expected_dim in zip(barcode, expected):
+        assert barcode_dim.dtype == expected_dim.dtype
+        np.testing.assert_array_equal(barcode_dim, expected_dim)
+
+
+def _assert_matches_default(dataset, k, **kwargs):
+    expected_barcode, expected_st_barcode = _barcodes(dataset, k)
+    barcode, st_barcode = _barcodes(dataset, k, **kwargs)
+    _assert_barcodes_equal(barcode, expected_barcode)
+    _assert_barcodes_equal(st_barcode, expected_st_barcode)
+
+
+@pytest.fixture
+def run_barcodes():
+    """`steenroder.barcodes` applied to a dataset as returned by the
+    builders above."""
+    return _barcodes
+
+
+@pytest.fixture
+def assert_barcodes_equal():
+    """Check that two barcodes have equal arrays, of equal dtypes."""
+    return _assert_barcodes_equal
+
+
+@pytest.fixture
+def assert_matches_default():
+    """Check that `steenroder.barcodes` on a dataset with given keyword
+    arguments gives the same ordinary and Sq^k-barcodes as without them."""
+    return _assert_matches_default
@@ -0,0 +1,47 @@
+"""Streaming many filtrations through `steenroder.barcodes_batch`."""
+import pytest
+
+import steenroder as st
+
+
+@pytest.fixture
+def rp_datasets(rp_triangulation):
+    return [rp_triangulation(n) for n in (2, 3, 4, 2)]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_barcodes_batch(rp_datasets, run_barcodes, assert_barcodes_equal,
+                        ordered):
+    results = list(st.barcodes_batch(
+        1, [dataset["filtration"] for dataset in rp_datasets], n_workers=2,
+        ordered=ordered
+        ))
+    positions = [i for i, _, _ in results]
+    if ordered:
+        assert positions == list(range(len(rp_datasets)))
+    else:
+        assert sorted(positions) == list(range(len(rp_datasets)))
+    for i, barcode, st_barcode in results:
+        expected_barcode, expected_st_barcode = \
+            run_barcodes(rp_datasets[i], 1)
+        assert_barcodes_equal(barcode, expected_barcode)
+        assert_barcodes_equal(st_barcode, expected_st_barcode)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_barcodes_batch_max_in_flight(rp_datasets, ordered):
+    """Filtrations are only consumed as results are yielded."""
+    consumed = []
+
+    def filtrations():
+        for dataset in rp_datasets:
+            consumed.append(dataset)
+            yield dataset["filtration"]
+
+    max_in_flight = 2
+    for n_yielded, _ in enumerate(st.barcodes_batch(
+            1, filtrations(), n_workers=2, ordered=ordered,
+            max_in_flight=max_in_flight
+            ), start=1):
+        assert len(consumed) <= n_yielded - 1 + max_in_flight
+    assert n_yielded == len(rp_datasets)
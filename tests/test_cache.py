@@ -0,0 +1,32 @@
+"""On-disk cache of the k-independent part of the computation."""
+import os
+
+
+def _n_entries(cache_dir):
+    return len([entry for entry in os.listdir(cache_dir)
+                if not entry.startswith(".")])
+
+
+def test_cache(steenrod_case, assert_matches_default, tmp_path):
+    """Barcodes are the same whether the reduction is computed and stored,
+    or loaded from the cache."""
+    dataset, k = steenrod_case
+    for _ in range(2):
+        stats = {}
+        assert_matches_default(dataset, k, cache_dir=tmp_path, stats=stats)
+    assert "load_cached_reduction" in stats["stages"]
+    assert _n_entries(tmp_path) == 1
+
+
+def test_chunked_cache_entries(steenrod_case, run_barcodes,
+                               assert_matches_default, tmp_path):
+    """Chunked reductions, whose representatives may differ, are cached
+    separately from sequential ones."""
+    dataset, k = steenrod_case
+    assert_matches_default(dataset, k, cache_dir=tmp_path, chunked=True,
+                           n_jobs=2)
+    run_barcodes(dataset, k, cache_dir=tmp_path)
+    assert _n_entries(tmp_path) == 2
+    assert_matches_default(dataset, k, cache_dir=tmp_path, chunked=True,
+                           n_jobs=2)
+    assert _n_entries(tmp_path) == 2
@@ -0,0 +1,62 @@
+"""Input filtrations and their organization by dimension."""
+import numpy as np
+
+import steenroder as st
+
+
+def _to_csr(filtration):
+    """Flat vertices and offsets of a filtration given as tuples, with the
+    vertices of each simplex in reverse order."""
+    vertices = np.array([v for spx in filtration for v in reversed(spx)],
+                        dtype=np.int64)
+    offsets = np.cumsum([0] + [len(spx) for spx in filtration])
+
+    return vertices, offsets
+
+
+def test_csr_filtration(rp_triangulation, cone, run_barcodes,
+                        assert_barcodes_equal):
+    """Filtrations in compressed sparse row format are organized and
+    processed as the same filtrations given as tuples."""
+    dataset = cone(rp_triangulation(3))
+    vertices, offsets = _to_csr(dataset["filtration"])
+    csr_dataset = dict(dataset, filtration=vertices, offsets=offsets)
+
+    filtration_by_dim = st.sort_filtration_by_dim(vertices, offsets=offsets)
+    expected_by_dim = st.sort_filtration_by_dim(dataset["filtration"])
+    assert len(filtration_by_dim) == len(expected_by_dim)
+    for arrays_dim, expected_arrays_dim in zip(filtration_by_dim,
+                                               expected_by_dim):
+        for arr, expected_arr in zip(arrays_dim, expected_arrays_dim):
+            np.testing.assert_array_equal(arr, expected_arr)
+
+    barcode, st_barcode = run_barcodes(csr_dataset, 1)
+    expected_barcode, expected_st_barcode = run_barcodes(dataset, 1)
+    assert_barcodes_equal(barcode, expected_barcode)
+    assert_barcodes_equal(st_barcode, expected_st_barcode)
+    assert any(len(st_barcode_dim) for st_barcode_dim in st_barcode)
+
+
+def test_save_load_filtration(flat_klein_bottle, run_barcodes,
+                              assert_barcodes_equal, tmp_path):
+    """Stored filtrations are loaded back unchanged, and give the same
+    barcodes when their path is passed to `barcodes`."""
+    dataset = flat_klein_bottle(6)
+    st.save_filtration(tmp_path, dataset["filtration"],
+                       filtration_values=dataset["filtration_values"])
+    filtration_by_dim, filtration_values = st.load_filtration(tmp_path)
+    np.testing.assert_array_equal(filtration_values,
+                                  dataset["filtration_values"])
+    assert len(filtration_by_dim) == len(dataset["filtration"])
+    for arrays_dim, expected_arrays_dim in zip(filtration_by_dim,
+                                               dataset["filtration"]):
+        for arr, expected_arr in zip(arrays_dim, expected_arrays_dim):
+            np.testing.assert_array_equal(arr, expected_arr)
+    assert len(st.load_filtration(tmp_path, maxdim=1)[0]) == 2
+
+    # Filtration values are read from the directory
+    barcode, st_barcode = run_barcodes(dict(dataset, filtration=tmp_path,
+                                            filtration_values=None), 1)
+    expected_barcode, expected_st_barcode = run_barcodes(dataset, 1)
+    assert_barcodes_equal(barcode, expected_barcode)
+    assert_barcodes_equal(st_barcode, expected_st_barcode)
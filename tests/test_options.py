@@ -0,0 +1,102 @@
+"""Options of `steenroder.barcodes` and `steenroder.barcodes_multi`, checked
+against the default computation."""
+import numpy as np
+
+import steenroder as st
+
+
+def test_barcodes_multi(rp_triangulation, cone, run_barcodes,
+                        assert_barcodes_equal):
+    """Repeated values of k are computed once, and each Sq^k-barcode is the
+    one computed by `barcodes` alone."""
+    dataset = cone(rp_triangulation(4))
+    barcode, st_barcodes = st.barcodes_multi(
+        [2, 1, 2], dataset["filtration"], offsets=dataset["offsets"],
+        filtration_values=dataset["filtration_values"]
+        )
+    assert list(st_barcodes) == [2, 1]
+    for k, st_barcode in st_barcodes.items():
+        expected_barcode, expected_st_barcode = run_barcodes(dataset, k)
+        assert_barcodes_equal(barcode, expected_barcode)
+        assert_barcodes_equal(st_barcode, expected_st_barcode)
+        assert any(len(st_barcode_dim) for st_barcode_dim in st_barcode)
+
+
+def _persistence(barcode_dim, filtration_values):
+    deaths, births = barcode_dim[:, 0], barcode_dim[:, 1]
+    if filtration_values is None:
+        persistence = (births - deaths).astype(np.float64)
+    else:
+        persistence = filtration_values[births] - filtration_values[deaths]
+    persistence[deaths == -1] = np.inf
+
+    return persistence
+
+
+def test_min_persistence(steenrod_case, run_barcodes, assert_matches_default,
+                         assert_barcodes_equal):
+    """Only Sq^k-bars at least as long as `min_persistence` are reported, and
+    they are the same as without it."""
+    dataset, k = steenrod_case
+    assert_matches_default(dataset, k, min_persistence=0.)
+
+    filtration_values = dataset["filtration_values"]
+    expected_barcode, expected_st_barcode = run_barcodes(dataset, k)
+    persistences = np.concatenate([
+        _persistence(st_barcode_dim, filtration_values)
+        for st_barcode_dim in expected_st_barcode
+        ])
+    finite = persistences[np.isfinite(persistences)]
+    # Thresholds keeping and dropping each finite bar
+    for min_persistence in np.concatenate([finite, finite + 1, [1.]]):
+        barcode, st_barcode = run_barcodes(dataset, k,
+                                           min_persistence=min_persistence)
+        assert_barcodes_equal(barcode, expected_barcode)
+        assert_barcodes_equal(st_barcode, [
+            st_barcode_dim[_persistence(st_barcode_dim, filtration_values)
+                           >= min_persistence]
+            for st_barcode_dim in expected_st_barcode
+            ])
+
+
+def test_minimize_reps(steenrod_case, assert_matches_default):
+    """Shortened representatives give the same Sq^k-barcodes."""
+    dataset, k = steenrod_case
+    stats = {}
+    assert_matches_default(dataset, k, minimize_reps=True, stats=stats)
+    nnz_before = stats["coho_reps"]["nnz_before"]
+    nnz_after = stats["coho_reps"]["nnz_after"]
+    assert len(nnz_after) == len(nnz_before)
+    assert all(after <= before
+               for after, before in zip(nnz_after, nnz_before))
+
+
+def test_n_jobs(steenrod_case, assert_matches_default):
+    dataset, k = steenrod_case
+    assert_matches_default(dataset, k, n_jobs=2)
+
+
+def test_chunked(steenrod_case, assert_matches_default):
+    """The chunk algorithm may change representatives, but not barcodes."""
+    dataset, k = steenrod_case
+    assert_matches_default(dataset, k, n_jobs=2, chunked=True)
+
+
+def test_degrees(steenrod_case, run_barcodes):
+    """Restricting to one degree gives its ordinary bars and the Sq^k-bars
+    of its squares, and empty barcodes elsewhere."""
+    dataset, k = steenrod_case
+    expected_barcode, expected_st_barcode = run_barcodes(dataset, k)
+    for degree in range(len(expected_barcode) - k):
+        barcode, st_barcode = run_barcodes(dataset, k, degrees=[degree])
+        for dim in range(len(expected_barcode)):
+            if dim == degree:
+                np.testing.assert_array_equal(barcode[dim],
+                                              expected_barcode[dim])
+            else:
+                assert not len(barcode[dim])
+            if dim == degree + k:
+                np.testing.assert_array_equal(st_barcode[dim],
+                                              expected_st_barcode[dim])
+            else:
+                assert not len(st_barcode[dim])
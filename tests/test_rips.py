@@ -0,0 +1,95 @@
+"""Vietoris–Rips filtrations built by `steenroder.rips_filtration`."""
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+import steenroder as st
+
+
+def _brute_force_rips(X, threshold, maxdim):
+    """All cliques with at most ``maxdim + 1`` vertices and diameter at most
+    `threshold`, mapped to their diameters."""
+    dm = np.sqrt(np.sum((X[:, np.newaxis] - X) ** 2, axis=-1))
+    simplices = {}
+    for r in range(1, maxdim + 2):
+        for spx in combinations(range(len(X)), r):
+            value = max((dm[u, v] for u, v in combinations(spx, 2)),
+                        default=0.)
+            if value <= threshold:
+                simplices[spx] = value
+
+    return simplices
+
+
+@pytest.mark.parametrize("threshold", [0.4, np.inf])
+def test_rips_filtration(threshold):
+    X = np.random.default_rng(0).random((15, 2))
+    filtration_by_dim, filtration_values = st.rips_filtration(
+        X, threshold=threshold, maxdim=3
+        )
+    expected = _brute_force_rips(X, threshold, 3)
+    simplices = {}
+    positions = np.empty(len(filtration_values), dtype=np.int64)
+    for idxs_dim, tups_dim in filtration_by_dim:
+        for idx, spx in zip(idxs_dim, tups_dim):
+            simplices[tuple(spx)] = filtration_values[idx]
+            positions[idx] = len(spx)
+    assert simplices.keys() == expected.keys()
+    for spx, value in expected.items():
+        assert simplices[spx] == pytest.approx(value)
+    # Ordered by filtration value, then by dimension
+    order = np.lexsort((positions, filtration_values))
+    np.testing.assert_array_equal(order, np.arange(len(filtration_values)))
+
+
+def test_rips_filtration_input_formats():
+    """Point clouds, condensed and square distance matrices give the same
+    filtration."""
+    X = np.random.default_rng(0).random((15, 3))
+    dm = np.sqrt(np.sum((X[:, np.newaxis] - X) ** 2, axis=-1))
+    expected_by_dim, expected_values = st.rips_filtration(X, threshold=0.6)
+    for filtration_by_dim, filtration_values in [
+            st.rips_filtration(dm[np.triu_indices(len(X), k=1)],
+                               threshold=0.6),
+            st.rips_filtration(dm, threshold=0.6, metric="precomputed")
+            ]:
+        np.testing.assert_allclose(filtration_values, expected_values)
+        for arrays_dim, expected_arrays_dim in zip(filtration_by_dim,
+                                                   expected_by_dim):
+            for arr, expected_arr in zip(arrays_dim, expected_arrays_dim):
+                np.testing.assert_array_equal(arr, expected_arr)
+
+
+def _sorted_rows(barcode_dim):
+    return barcode_dim[np.lexsort(barcode_dim.T[::-1])]
+
+
+def test_collapse_edges(flat_klein_bottle_distances):
+    """Edge collapses preserve ordinary and Sq^1-barcodes in filtration
+    values, in degrees below `maxdim`."""
+    dm = flat_klein_bottle_distances(8)
+    maxdim = 3
+    collapsed_by_dim, collapsed_values = st.rips_filtration(
+        dm, threshold=0.3, maxdim=maxdim, collapse_edges=True
+        )
+    filtration_by_dim, filtration_values = st.rips_filtration(
+        dm, threshold=0.3, maxdim=maxdim
+        )
+    assert len(collapsed_values) < len(filtration_values)
+
+    barcode, st_barcode = st.barcodes(
+        1, collapsed_by_dim, filtration_values=collapsed_values,
+        return_filtration_values=True
+        )
+    expected_barcode, expected_st_barcode = st.barcodes(
+        1, filtration_by_dim, filtration_values=filtration_values,
+        return_filtration_values=True
+        )
+    assert any(len(st_barcode_dim)
+               for st_barcode_dim in expected_st_barcode[:maxdim])
+    for dim in range(maxdim):
+        np.testing.assert_array_equal(_sorted_rows(barcode[dim]),
+                                      _sorted_rows(expected_barcode[dim]))
+        np.testing.assert_array_equal(_sorted_rows(st_barcode[dim]),
+                                      _sorted_rows(expected_st_barcode[dim]))
@@ -0,0 +1,35 @@
+"""Simplex indices used to look up simplices by their vertices."""
+import steenroder as st
+
+
+def test_sparse_vertex_labels(assert_barcodes_equal):
+    """Sparse vertex labels are indexed without a table of binomial
+    coefficients per label."""
+    barcode, st_barcode = st.barcodes(1, [(0,), (3 * 10 ** 8,),
+                                          (0, 3 * 10 ** 8)])
+    expected_barcode, expected_st_barcode = st.barcodes(1, [(0,), (1,),
+                                                            (0, 1)])
+    assert_barcodes_equal(barcode, expected_barcode)
+    assert_barcodes_equal(st_barcode, expected_st_barcode)
+
+
+def test_lexicographic_index(flat_klein_bottle, run_barcodes,
+                             assert_barcodes_equal):
+    """Spreading out the vertex labels switches to lexicographic indices
+    without changing the barcodes."""
+    dataset = flat_klein_bottle(6)
+    sparse_dataset = dict(dataset, filtration=[
+        [idxs_dim, tups_dim * 10 ** 6]
+        for idxs_dim, tups_dim in dataset["filtration"]
+        ])
+    simplex_index = st.get_reduced_triangular(dataset["filtration"])[0]
+    sparse_simplex_index = \
+        st.get_reduced_triangular(sparse_dataset["filtration"])[0]
+    assert all(len(index_dim[0]) for index_dim in simplex_index)
+    assert not any(len(index_dim[0]) for index_dim in sparse_simplex_index)
+
+    barcode, st_barcode = run_barcodes(sparse_dataset, 1)
+    expected_barcode, expected_st_barcode = run_barcodes(dataset, 1)
+    assert_barcodes_equal(barcode, expected_barcode)
+    assert_barcodes_equal(st_barcode, expected_st_barcode)
+    assert any(len(st_barcode_dim) for st_barcode_dim in st_barcode)
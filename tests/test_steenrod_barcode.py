@@ -0,0 +1,26 @@
+"""Steenrod barcodes against known answers."""
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("n, k, n_bars", [(2, 1, [0, 0, 1]),
+                                          (3, 2, [0, 0, 0, 0]),
+                                          (4, 1, [0, 0, 1, 0, 1]),
+                                          (4, 2, [0, 0, 0, 0, 1])])
+def test_rp_steenrod_bars(rp_triangulation, run_barcodes, n, k, n_bars):
+    """In the cohomology of RP^n, generated by x in degree 1, Sq^k(x^i) =
+    C(i, k) x^(i + k). The filtration adds all simplices at once, up to
+    order, so all bars are essential."""
+    _, st_barcode = run_barcodes(rp_triangulation(n), k)
+    assert [len(st_barcode_dim) for st_barcode_dim in st_barcode] == n_bars
+    for st_barcode_dim in st_barcode:
+        assert np.all(st_barcode_dim[:, 0] == -1)
+
+
+def test_cone_rp4_sq2_bar(rp_triangulation, cone, run_barcodes):
+    """Sq^2 from degree 2 to 4 of RP^4 dies when the cone on its top
+    simplices enters."""
+    _, st_barcode = run_barcodes(cone(rp_triangulation(4)), 2)
+    assert [len(st_barcode_dim) for st_barcode_dim in st_barcode] == \
+        [0, 0, 0, 0, 0, 1]
+    assert st_barcode[5][0, 0] != -1